@@ -79,14 +79,22 @@ class ProjectSetup:
         from src.database.creator import DatabaseCreator
         from src.database.seeder import DatabaseSeeder
         
-        # Create database
-        creator = DatabaseCreator(str(self.data_dir / 'ecommerce.db'))
+        # Build the database in memory; it is written to disk in one pass below
+        creator = DatabaseCreator(':memory:')
         conn = creator.create_database()
         
         # Populate with sample data
         seeder = DatabaseSeeder(conn)
         seeder.populate_all()
         
+        # Build indexes in one pass now that the data is loaded, then
+        # gather statistics before the summary tables are computed
+        creator.create_indexes()
+        creator.analyze()
+        creator.refresh_materialized_views()
+        creator.backup(str(self.data_dir / 'ecommerce.db'))
+        creator.close()
+        
         print("✅ Database initialized with sample data")
     
     def run_setup(self):
@@ -69,8 +69,8 @@ class TextToSQLAgent:
             # Create data directory if it doesn't exist
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            # Connect to database
-            conn = sqlite3.connect(self.db_path)
+            # Connect to database (shared with the validator's worker threads)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
             
             # Enable foreign keys for referential integrity
             conn.execute("PRAGMA foreign_keys = ON")
@@ -110,10 +110,14 @@ class TextToSQLAgent:
         """
         cursor = self.conn.cursor()
         
-        # Query SQLite's master table for all table definitions
+        # Query SQLite's master table for all table definitions, leaving out
+        # the FTS virtual tables and their shadow tables
         cursor.execute("""
             SELECT name, sql FROM sqlite_master 
             WHERE type='table' 
+            AND name NOT IN (
+                SELECT name FROM pragma_table_list WHERE type IN ('shadow', 'virtual')
+            )
             ORDER BY name
         """)
         
@@ -261,12 +265,13 @@ class TextToSQLAgent:
         9. Return ONLY the SQL query without any explanation or markdown
         
         Common patterns:
-        - Revenue calculations: SUM(order_items.subtotal) or SUM(orders.total_amount)
+        - Money columns (price, cost, unit_price, subtotal, tax_amount, shipping_cost, discount_amount, total, total_amount) are INTEGER cents: divide by 100.0 to show dollars, and multiply dollar thresholds by 100
+        - Revenue calculations: SUM(order_items.subtotal) or SUM(orders.total_amount), both in cents
         - Best sellers: GROUP BY product, ORDER BY COUNT or SUM(quantity)
         - Date filters: Use DATE() function and BETWEEN for date ranges
         - Customer analysis: JOIN customers with orders and order_items
         - Inventory checks: products.stock_quantity for current stock
-        - Status filters: Use orders.status for order states (pending, completed, shipped)
+        - Status filters: JOIN the lookup table on status_id and filter by name, e.g. orders JOIN order_status ON orders.status_id = order_status.status_id WHERE order_status.name = 'shipped'
         
         SQLite specific functions to remember:
         - DATE('now') for current date
@@ -5,12 +5,26 @@ Validates SQL queries for safety, correctness, and performance.
 
 import re
 import sqlite3
+import asyncio
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Common syntax mistakes as (required keywords, pattern, message). Each pattern
+# can only match when every keyword appears in the query, so a cheap substring
+# prefilter lets most valid queries skip the regex engine entirely.
+_COMMON_MISTAKES = [
+    (('select', 'from'),
+     re.compile(r'SELECT\s+\w+\s+\w+\s+FROM', re.IGNORECASE),
+     "Possible missing comma between SELECT columns"),
+    (('join', 'where'),
+     re.compile(r'JOIN\s+\w+\s+WHERE', re.IGNORECASE),
+     "JOIN without ON clause"),
+]
+
 
 class QueryValidator:
     """
@@ -29,6 +43,9 @@ class QueryValidator:
         """
         self.conn = db_connection
         
+        # Serializes database checks when validate_async runs on worker threads
+        self._db_lock = threading.Lock()
+        
         # Dangerous keywords that should not be in queries
         self.dangerous_keywords = [
             'DROP', 'DELETE', 'TRUNCATE', 'ALTER', 
@@ -159,6 +176,23 @@ class QueryValidator:
         
         return result
     
+    async def validate_async(self, sql_query: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Validate a SQL query on a worker thread.
+        
+        Lets an async agent loop overlap validation (including the EXPLAIN
+        round-trip) with other awaitables such as the next LLM request.
+        The connection must be opened with check_same_thread=False.
+        
+        Args:
+            sql_query: SQL query to validate
+            context: Optional context information
+            
+        Returns:
+            Validation result dictionary
+        """
+        return await asyncio.to_thread(self.validate, sql_query, context)
+    
     def _check_structure(self, query: str, context: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Check query structure and composition.
@@ -495,8 +529,9 @@ class QueryValidator:
     def _validate_with_database(self, query: str) -> Dict[str, Any]:
         """Validate query with actual database."""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(f"EXPLAIN QUERY PLAN {query}")
+            with self._db_lock:
+                cursor = self.conn.cursor()
+                cursor.execute(f"EXPLAIN QUERY PLAN {query}")
             return {'valid': True}
         except sqlite3.Error as e:
             return {'valid': False, 'error': str(e)}
@@ -505,13 +540,15 @@ class QueryValidator:
         """Check for common SQL syntax mistakes."""
         mistakes = []
         
-        # Missing commas between columns
-        if re.search(r'SELECT\s+\w+\s+\w+\s+FROM', query, re.IGNORECASE):
-            mistakes.append("Possible missing comma between SELECT columns")
+        # Case-insensitive regexes also fold some non-ASCII characters,
+        # so only trust the keyword prefilter for plain ASCII queries
+        query_lower = query.lower() if query.isascii() else None
         
-        # Wrong JOIN syntax
-        if re.search(r'JOIN\s+\w+\s+WHERE', query, re.IGNORECASE):
-            mistakes.append("JOIN without ON clause")
+        for keywords, pattern, message in _COMMON_MISTAKES:
+            if query_lower is not None and not all(k in query_lower for k in keywords):
+                continue
+            if pattern.search(query):
+                mistakes.append(message)
         
         return mistakes
     
@@ -617,9 +654,10 @@ class QueryValidator:
         if not self.conn:
             return []
         
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        return [row[0] for row in cursor.fetchall()]
+        with self._db_lock:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            return [row[0] for row in cursor.fetchall()]
     
     def _find_duplicate_conditions(self, query: str) -> bool:
         """Find duplicate conditions in WHERE clause."""
@@ -6,14 +6,444 @@ relationships, and indexes for optimal query performance.
 
 import sqlite3
 import logging
+import copy
 import os
+import threading
+from itertools import groupby
+from operator import itemgetter
 from typing import Optional, List, Tuple
 from datetime import datetime
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Values of each status lookup table; a status id is its 1-based position
+STATUS_LOOKUPS = {
+    'order_status': ('pending', 'confirmed', 'processing', 'shipped',
+                     'delivered', 'cancelled', 'refunded'),
+    'payment_status': ('pending', 'paid', 'failed', 'refunded'),
+    'fulfillment_status': ('pending', 'packed', 'shipped', 'delivered'),
+    'review_status': ('pending', 'approved', 'rejected'),
+    'cart_status': ('active', 'abandoned', 'converted'),
+}
+
+
+def status_id(lookup: str, name: str) -> int:
+    """
+    Get the id of a status in one of the lookup tables.
+    
+    Args:
+        lookup: Lookup table name from STATUS_LOOKUPS
+        name: Status name, e.g. 'cancelled'
+        
+    Returns:
+        The status_id stored for that name
+    """
+    return STATUS_LOOKUPS[lookup].index(name) + 1
+
+
+# Summary queries stored as materialized tables (see refresh_materialized_views).
+# Money columns are integer cents, like the tables they summarize
+MATERIALIZED_VIEWS = {
+    'customer_summary_mv': f'''
+        SELECT 
+            c.customer_id,
+            c.first_name || ' ' || c.last_name as full_name,
+            c.email,
+            c.customer_type,
+            COUNT(DISTINCT o.order_id) as total_orders,
+            COALESCE(SUM(o.total_amount), 0) as lifetime_value,
+            COALESCE(AVG(o.total_amount), 0) as avg_order_value,
+            MAX(o.order_date) as last_order_date,
+            c.created_at as customer_since
+        FROM customers c
+        LEFT JOIN orders o ON c.customer_id = o.customer_id AND o.status_id != {status_id('order_status', 'cancelled')}
+        GROUP BY c.customer_id
+    ''',
+    'product_performance_mv': f'''
+        SELECT 
+            p.product_id,
+            p.product_name,
+            p.brand,
+            c.category_name,
+            p.price,
+            p.stock_quantity,
+            COALESCE(SUM(oi.quantity), 0) as units_sold,
+            COALESCE(SUM(oi.total), 0) as revenue,
+            p.rating_average,
+            p.rating_count,
+            p.view_count
+        FROM products p
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN order_items oi ON p.product_id = oi.product_id
+        LEFT JOIN orders o ON oi.order_id = o.order_id AND o.status_id != {status_id('order_status', 'cancelled')}
+        GROUP BY p.product_id
+    ''',
+    'low_stock_products_mv': '''
+        SELECT 
+            p.product_id,
+            p.product_name,
+            p.sku,
+            p.stock_quantity,
+            p.reserved_quantity,
+            p.reorder_level,
+            p.available_quantity,
+            c.category_name
+        FROM products p
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        WHERE p.is_active = 1 
+        AND p.available_quantity <= p.reorder_level
+        ORDER BY p.available_quantity ASC
+    ''',
+    'monthly_revenue_mv': f'''
+        SELECT 
+            strftime('%Y-%m', order_date) as month,
+            COUNT(DISTINCT order_id) as total_orders,
+            COUNT(DISTINCT customer_id) as unique_customers,
+            SUM(total_amount) as revenue,
+            AVG(total_amount) as avg_order_value
+        FROM orders
+        WHERE status_id NOT IN ({status_id('order_status', 'cancelled')}, {status_id('order_status', 'refunded')})
+        GROUP BY strftime('%Y-%m', order_date)
+        ORDER BY month DESC
+    ''',
+}
+
+
+def _lookup_table_ddl(table: str, names: Tuple[str, ...]) -> str:
+    """
+    Build the SQL that creates and fills one status lookup table.
+    
+    Args:
+        table: Lookup table name
+        names: Status names, stored with ids 1..n in order
+        
+    Returns:
+        SQL script for the table
+    """
+    values = ", ".join(
+        f"({i}, '{name}')" for i, name in enumerate(names, start=1)
+    )
+    return f'''
+    CREATE TABLE {table} (
+        status_id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    ) STRICT;
+    INSERT INTO {table} (status_id, name) VALUES {values};
+    '''
+
+
+# The complete schema, assembled once at import in dependency order
+_DDL = "".join([
+    # Status lookup tables: each maps a small integer status_id to its name,
+    # so the main tables store a 1-byte id instead of a repeated string
+    *(_lookup_table_ddl(table, names) for table, names in STATUS_LOOKUPS.items()),
+    
+    # Product categories, organized as a hierarchy
+    '''
+    CREATE TABLE categories (
+        category_id INTEGER PRIMARY KEY,
+        category_name TEXT NOT NULL UNIQUE,
+        description TEXT,
+        parent_category_id INTEGER,
+        is_active INTEGER DEFAULT TRUE,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (parent_category_id) REFERENCES categories(category_id)
+    ) STRICT;
+    ''',
+    
+    # Customer accounts and profiles
+    '''
+    CREATE TABLE customers (
+        customer_id INTEGER PRIMARY KEY,
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        phone TEXT,
+        password_hash TEXT,  -- In production, store hashed passwords
+        address TEXT,
+        city TEXT,
+        state TEXT,
+        zip_code TEXT,
+        country TEXT DEFAULT 'USA',
+        date_of_birth TEXT,
+        gender TEXT,
+        is_active INTEGER DEFAULT TRUE,
+        email_verified INTEGER DEFAULT FALSE,
+        loyalty_points INTEGER DEFAULT 0,
+        customer_type TEXT DEFAULT 'regular',  -- regular, premium, vip
+        preferred_payment_method TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        last_login_at TEXT,
+        
+        -- Indexes on commonly searched fields are created separately
+        CHECK (email LIKE '%@%'),  -- Basic email validation
+        CHECK (loyalty_points >= 0)  -- Points cannot be negative
+    ) STRICT;
+    ''',
+    
+    # Product catalog, including inventory levels
+    '''
+    CREATE TABLE products (
+        product_id INTEGER PRIMARY KEY,
+        product_name TEXT NOT NULL,
+        category_id INTEGER,
+        sku TEXT UNIQUE,  -- Stock Keeping Unit
+        price INTEGER NOT NULL,  -- In cents
+        price_display REAL GENERATED ALWAYS AS (price / 100.0) VIRTUAL,  -- In dollars
+        cost INTEGER NOT NULL,  -- In cents; cost to business (for profit calculations)
+        stock_quantity INTEGER DEFAULT 0,
+        reserved_quantity INTEGER DEFAULT 0,  -- Items in active carts
+        reorder_level INTEGER DEFAULT 10,  -- When to reorder
+        available_quantity INTEGER GENERATED ALWAYS AS (stock_quantity - reserved_quantity) STORED,
+        description TEXT,
+        brand TEXT,
+        weight REAL,  -- In kg
+        dimensions TEXT,  -- LxWxH format
+        color TEXT,
+        size TEXT,
+        material TEXT,
+        is_active INTEGER DEFAULT TRUE,
+        is_featured INTEGER DEFAULT FALSE,
+        discount_percentage REAL DEFAULT 0,
+        tax_rate REAL DEFAULT 0,
+        rating_average REAL DEFAULT 0,  -- Average from reviews
+        rating_count INTEGER DEFAULT 0,
+        view_count INTEGER DEFAULT 0,  -- Product page views
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        launch_date TEXT,
+        discontinue_date TEXT,
+        
+        FOREIGN KEY (category_id) REFERENCES categories(category_id),
+        CHECK (price >= 0),
+        CHECK (stock_quantity >= 0),
+        CHECK (reserved_quantity >= 0),
+        CHECK (discount_percentage >= 0 AND discount_percentage <= 100),
+        CHECK (rating_average >= 0 AND rating_average <= 5)
+    ) STRICT;
+    ''',
+    
+    # Order headers
+    '''
+    CREATE TABLE orders (
+        order_id INTEGER PRIMARY KEY,
+        customer_id INTEGER NOT NULL,
+        order_number TEXT UNIQUE,  -- Human-readable order number
+        order_date TEXT DEFAULT CURRENT_TIMESTAMP,
+        required_date TEXT,  -- When customer needs the order
+        shipped_date TEXT,
+        delivered_date TEXT,
+        status_id INTEGER DEFAULT 1,  -- order_status: pending, confirmed, processing, shipped, delivered, cancelled, refunded
+        payment_status_id INTEGER DEFAULT 1,  -- payment_status: pending, paid, failed, refunded
+        payment_method TEXT,  -- credit_card, debit_card, paypal, apple_pay, google_pay, bank_transfer
+        payment_transaction_id TEXT,
+        subtotal INTEGER NOT NULL DEFAULT 0,  -- In cents; before tax and shipping
+        tax_amount INTEGER NOT NULL DEFAULT 0,  -- In cents
+        shipping_cost INTEGER NOT NULL DEFAULT 0,  -- In cents
+        discount_amount INTEGER NOT NULL DEFAULT 0,  -- In cents
+        total_amount INTEGER NOT NULL DEFAULT 0,  -- In cents; final amount
+        total_amount_display REAL GENERATED ALWAYS AS (total_amount / 100.0) VIRTUAL,  -- In dollars
+        currency TEXT DEFAULT 'USD',
+        shipping_method TEXT,  -- standard, express, overnight
+        shipping_address TEXT,
+        shipping_city TEXT,
+        shipping_state TEXT,
+        shipping_zip TEXT,
+        shipping_country TEXT,
+        billing_address TEXT,
+        billing_city TEXT,
+        billing_state TEXT,
+        billing_zip TEXT,
+        billing_country TEXT,
+        tracking_number TEXT,
+        notes TEXT,  -- Customer notes
+        internal_notes TEXT,  -- Staff notes
+        ip_address TEXT,  -- For fraud detection
+        user_agent TEXT,  -- Browser info for analytics
+        referrer_source TEXT,  -- Where customer came from
+        coupon_code TEXT,
+        gift_message TEXT,
+        is_gift INTEGER DEFAULT FALSE,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        
+        FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
+        FOREIGN KEY (status_id) REFERENCES order_status(status_id),
+        FOREIGN KEY (payment_status_id) REFERENCES payment_status(status_id),
+        CHECK (total_amount >= 0)
+    ) STRICT;
+    ''',
+    
+    # Individual line items for each order
+    '''
+    CREATE TABLE order_items (
+        order_id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL,
+        unit_price INTEGER NOT NULL,  -- In cents; price at time of purchase
+        discount_amount INTEGER NOT NULL DEFAULT 0,  -- In cents
+        tax_amount INTEGER NOT NULL DEFAULT 0,  -- In cents
+        subtotal INTEGER NOT NULL,  -- In cents; quantity * unit_price - discount
+        total INTEGER NOT NULL,  -- In cents; subtotal + tax
+        is_gift INTEGER DEFAULT FALSE,
+        gift_wrap INTEGER DEFAULT FALSE,
+        notes TEXT,
+        fulfillment_status_id INTEGER DEFAULT 1,  -- fulfillment_status: pending, packed, shipped, delivered
+        return_status TEXT,  -- requested, approved, received, refunded
+        return_reason TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        
+        FOREIGN KEY (order_id) REFERENCES orders(order_id) ON DELETE CASCADE,
+        FOREIGN KEY (product_id) REFERENCES products(product_id),
+        FOREIGN KEY (fulfillment_status_id) REFERENCES fulfillment_status(status_id),
+        CHECK (quantity > 0),
+        CHECK (unit_price >= 0),
+        CHECK (subtotal >= 0),
+        PRIMARY KEY (order_id, product_id)  -- One line per product per order
+    ) STRICT, WITHOUT ROWID;
+    ''',
+    
+    # Inventory movements, kept for auditing
+    '''
+    CREATE TABLE inventory_log (
+        log_id INTEGER PRIMARY KEY,
+        product_id INTEGER NOT NULL,
+        change_type TEXT NOT NULL,  -- purchase, sale, return, adjustment, damage, theft
+        quantity_change INTEGER NOT NULL,  -- Positive for additions, negative for removals
+        quantity_before INTEGER NOT NULL,
+        quantity_after INTEGER NOT NULL,
+        reference_type TEXT,  -- order, return, adjustment, etc.
+        reference_id INTEGER,  -- ID of the related record
+        notes TEXT,
+        performed_by TEXT,  -- User who made the change
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        
+        FOREIGN KEY (product_id) REFERENCES products(product_id)
+    ) STRICT;
+    ''',
+    
+    # Customer reviews and ratings for products
+    '''
+    CREATE TABLE product_reviews (
+        review_id INTEGER PRIMARY KEY,
+        product_id INTEGER NOT NULL,
+        customer_id INTEGER NOT NULL,
+        order_id INTEGER,  -- Link to verified purchase
+        rating INTEGER NOT NULL,
+        title TEXT,
+        comment TEXT,
+        is_verified_purchase INTEGER DEFAULT FALSE,
+        is_recommended INTEGER DEFAULT TRUE,
+        helpful_count INTEGER DEFAULT 0,
+        not_helpful_count INTEGER DEFAULT 0,
+        is_featured INTEGER DEFAULT FALSE,
+        status_id INTEGER DEFAULT 1,  -- review_status: pending, approved, rejected
+        moderation_notes TEXT,
+        response_from_seller TEXT,
+        response_date TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        
+        FOREIGN KEY (product_id) REFERENCES products(product_id),
+        FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
+        FOREIGN KEY (order_id) REFERENCES orders(order_id),
+        FOREIGN KEY (status_id) REFERENCES review_status(status_id),
+        CHECK (rating >= 1 AND rating <= 5),
+        UNIQUE(product_id, customer_id, order_id)  -- One review per product per order
+    ) STRICT;
+    ''',
+    
+    # Shopping carts and the items in them
+    '''
+    CREATE TABLE cart (
+        cart_id INTEGER PRIMARY KEY,
+        customer_id INTEGER,
+        session_id TEXT,  -- For anonymous users
+        status_id INTEGER DEFAULT 1,  -- cart_status: active, abandoned, converted
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        expires_at TEXT,  -- When to clean up abandoned carts
+        
+        FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
+        FOREIGN KEY (status_id) REFERENCES cart_status(status_id),
+        CHECK (customer_id IS NOT NULL OR session_id IS NOT NULL)  -- Must have either customer or session
+    ) STRICT;
+    ''',
+    '''
+    CREATE TABLE cart_items (
+        cart_id INTEGER NOT NULL,
+        product_id INTEGER NOT NULL,
+        quantity INTEGER NOT NULL DEFAULT 1,
+        added_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        saved_for_later INTEGER DEFAULT FALSE,
+        
+        FOREIGN KEY (cart_id) REFERENCES cart(cart_id) ON DELETE CASCADE,
+        FOREIGN KEY (product_id) REFERENCES products(product_id),
+        CHECK (quantity > 0),
+        PRIMARY KEY (cart_id, product_id)  -- One entry per product per cart
+    ) STRICT, WITHOUT ROWID;
+    ''',
+    
+    # Materialized view tables, created empty with the right columns and
+    # filled by DatabaseCreator.refresh_materialized_views()
+    *(
+        f"\n    CREATE TABLE {name} AS SELECT * FROM ({query}) WHERE 0;\n"
+        for name, query in MATERIALIZED_VIEWS.items()
+    ),
+    
+    # External-content FTS5 indexes over the descriptive text, so searches
+    # can use MATCH instead of LIKE '%term%'. The triggers keep them in sync
+    '''
+    CREATE VIRTUAL TABLE products_fts USING fts5(
+        product_name, description, brand,
+        content='products', content_rowid='product_id'
+    );
+    
+    CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, product_name, description, brand)
+        VALUES (new.product_id, new.product_name, new.description, new.brand);
+    END;
+    
+    CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, product_name, description, brand)
+        VALUES ('delete', old.product_id, old.product_name, old.description, old.brand);
+    END;
+    
+    CREATE TRIGGER products_fts_au AFTER UPDATE OF product_name, description, brand ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, product_name, description, brand)
+        VALUES ('delete', old.product_id, old.product_name, old.description, old.brand);
+        INSERT INTO products_fts(rowid, product_name, description, brand)
+        VALUES (new.product_id, new.product_name, new.description, new.brand);
+    END;
+    
+    CREATE VIRTUAL TABLE product_reviews_fts USING fts5(
+        title, comment,
+        content='product_reviews', content_rowid='review_id'
+    );
+    
+    CREATE TRIGGER product_reviews_fts_ai AFTER INSERT ON product_reviews BEGIN
+        INSERT INTO product_reviews_fts(rowid, title, comment)
+        VALUES (new.review_id, new.title, new.comment);
+    END;
+    
+    CREATE TRIGGER product_reviews_fts_ad AFTER DELETE ON product_reviews BEGIN
+        INSERT INTO product_reviews_fts(product_reviews_fts, rowid, title, comment)
+        VALUES ('delete', old.review_id, old.title, old.comment);
+    END;
+    
+    CREATE TRIGGER product_reviews_fts_au AFTER UPDATE OF title, comment ON product_reviews BEGIN
+        INSERT INTO product_reviews_fts(product_reviews_fts, rowid, title, comment)
+        VALUES ('delete', old.review_id, old.title, old.comment);
+        INSERT INTO product_reviews_fts(rowid, title, comment)
+        VALUES (new.review_id, new.title, new.comment);
+    END;
+    ''',
+])
+
 
 class DatabaseCreator:
     """
@@ -31,14 +461,46 @@ class DatabaseCreator:
             db_path: Path where the database will be created
         """
         self.db_path = db_path
-        self.conn: Optional[sqlite3.Connection] = None
+        self._schema_cache: Optional[dict] = None
+        
+        # Serializes writes on the shared connection; reads don't take it.
+        # Reentrant because create_database() may call create_indexes()
+        self._write_lock = threading.RLock()
+        
+        # Ensure the directory exists (':memory:' has none)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # One connection is kept open and reused by every operation
+        self.conn: Optional[sqlite3.Connection] = self._connect()
         
-        logger.info(f"DatabaseCreator initialized with path: {db_path}")
+        logger.info("DatabaseCreator initialized with path: %s", db_path)
     
-    def create_database(self, drop_existing: bool = True) -> sqlite3.Connection:
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the connection shared by all operations of this creator.
+        
+        isolation_level=None leaves transaction control to the explicit
+        BEGIN IMMEDIATE/COMMIT in each script, and check_same_thread=False lets
+        other threads reuse the connection.
+        
+        Returns:
+            Open connection with the cache PRAGMAs applied
+        """
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        
+        # Per-connection caching: 64 MB page cache and 256 MB of mmap I/O
+        conn.executescript(
+            "PRAGMA cache_size = -65536;\n"
+            "PRAGMA mmap_size = 268435456;\n"
+        )
+        
+        return conn
+    
+    def create_database(self, drop_existing: bool = True,
+                        defer_indexes: bool = True) -> sqlite3.Connection:
         """
         Create the complete database schema.
         
@@ -47,72 +509,103 @@ class DatabaseCreator:
         
         Args:
             drop_existing: Whether to drop existing tables before creating new ones
+            defer_indexes: Whether to leave index creation to a later call to
+                create_indexes(), after the bulk data load
             
         Returns:
             Connection to the created database
         """
-        logger.info(f"Creating database at {self.db_path}")
+        logger.info("Creating database at %s", self.db_path)
         
-        try:
-            # Establish connection
-            self.conn = sqlite3.connect(self.db_path)
-            cursor = self.conn.cursor()
-            
-            # Enable foreign keys for referential integrity
-            cursor.execute("PRAGMA foreign_keys = ON")
-            
-            # Set journal mode for better concurrency
-            cursor.execute("PRAGMA journal_mode = WAL")
-            
-            # Drop existing tables if requested
-            if drop_existing:
-                self._drop_existing_tables(cursor)
-            
-            # Create tables in order of dependencies
-            self._create_categories_table(cursor)
-            self._create_customers_table(cursor)
-            self._create_products_table(cursor)
-            self._create_orders_table(cursor)
-            self._create_order_items_table(cursor)
-            
-            # Create additional utility tables
-            self._create_inventory_log_table(cursor)
-            self._create_product_reviews_table(cursor)
-            self._create_cart_table(cursor)
-            
-            # Create indexes for better performance
-            self._create_indexes(cursor)
-            
-            # Create views for common queries
-            self._create_views(cursor)
+        with self._write_lock:
+            self._schema_cache = None
             
-            # Commit all changes
-            self.conn.commit()
-            
-            logger.info("Database schema created successfully")
-            
-            # Verify the creation
-            self._verify_schema(cursor)
-            
-            return self.conn
-            
-        except Exception as e:
-            logger.error(f"Failed to create database: {e}")
-            if self.conn:
-                self.conn.rollback()
-            raise
+            try:
+                # Reopen the shared connection if close() was called
+                if not self.conn:
+                    self.conn = self._connect()
+                cursor = self.conn.cursor()
+                
+                # PRAGMAs go before BEGIN: journal_mode cannot change and
+                # foreign_keys is ignored inside a transaction
+                if drop_existing:
+                    # A full rebuild is recovered by re-running the creator, so
+                    # skip journaling and fsyncs while the schema is built
+                    prelude = (
+                        # Takes effect at once on a new or in-memory database
+                        "PRAGMA page_size = 8192;\n"
+                        "PRAGMA journal_mode = OFF;\n"
+                        "PRAGMA synchronous = OFF;\n"
+                        "PRAGMA foreign_keys = OFF;\n"
+                        "PRAGMA temp_store = MEMORY;\n"
+                        "PRAGMA locking_mode = EXCLUSIVE;\n"
+                        + self._drop_existing_tables()
+                        # Larger pages mean shallower B-trees for the wide rows.
+                        # The size only changes on an empty, non-WAL database,
+                        # which is exactly what the drops above leave behind
+                        + "PRAGMA page_size = 8192;\n"
+                        "VACUUM;\n"
+                    )
+                else:
+                    prelude = (
+                        "PRAGMA foreign_keys = ON;\n"
+                        # Applies when this creates a brand new database file.
+                        # It has to come before WAL: switching the journal
+                        # mode writes the header and fixes the page size
+                        "PRAGMA page_size = 8192;\n"
+                        "PRAGMA journal_mode = WAL;\n"
+                    )
+                
+                # IMMEDIATE takes the write lock up front, so a concurrent
+                # writer waits or fails at BEGIN rather than mid-script
+                ddl = prelude + "BEGIN IMMEDIATE;\n" + _DDL + "\nCOMMIT;"
+                cursor.executescript(ddl)
+                
+                # Indexes are cheaper to build in one pass after the data load
+                if not defer_indexes:
+                    self.create_indexes()
+                
+                if drop_existing:
+                    # Restore durable settings for normal use of the database.
+                    # The exclusive lock is only released by the next access
+                    # after locking_mode goes back to NORMAL, and a connection
+                    # that enters WAL while still exclusive keeps its lock, so
+                    # release it before switching to WAL
+                    cursor.executescript(
+                        "PRAGMA locking_mode = NORMAL;\n"
+                        "SELECT COUNT(*) FROM sqlite_master;\n"
+                        "PRAGMA journal_mode = WAL;\n"
+                        "PRAGMA synchronous = NORMAL;\n"
+                        "PRAGMA foreign_keys = ON;\n"
+                    )
+                
+                logger.info("Database schema created successfully")
+                
+                # Verify the creation
+                self._verify_schema(cursor)
+                
+                return self.conn
+                
+            except Exception as e:
+                logger.error("Failed to create database: %s", e)
+                if self.conn:
+                    self.conn.rollback()
+                raise
     
-    def _drop_existing_tables(self, cursor: sqlite3.Cursor):
+    def _drop_existing_tables(self) -> str:
         """
-        Drop existing tables if they exist.
+        Build the SQL that drops existing tables if they exist.
         
         We drop in reverse order of creation to respect foreign keys.
         
-        Args:
-            cursor: Database cursor
+        Returns:
+            SQL transaction dropping all views and tables
         """
         # List of tables in reverse dependency order
         tables = [
+            *MATERIALIZED_VIEWS,
+            'products_fts',
+            'product_reviews_fts',
             'cart_items',
             'cart',
             'product_reviews',
@@ -121,10 +614,11 @@ class DatabaseCreator:
             'orders',
             'products',
             'customers',
-            'categories'
+            'categories',
+            *STATUS_LOOKUPS
         ]
         
-        # Also drop views
+        # Also drop views left by older versions of the schema
         views = [
             'customer_summary',
             'product_performance',
@@ -134,503 +628,152 @@ class DatabaseCreator:
         
         logger.info("Dropping existing tables and views...")
         
-        # Drop views first
-        for view in views:
-            try:
-                cursor.execute(f"DROP VIEW IF EXISTS {view}")
-                logger.debug(f"Dropped view if exists: {view}")
-            except sqlite3.Error as e:
-                logger.warning(f"Could not drop view {view}: {e}")
-        
-        # Drop tables
-        for table in tables:
-            try:
-                cursor.execute(f"DROP TABLE IF EXISTS {table}")
-                logger.debug(f"Dropped table if exists: {table}")
-            except sqlite3.Error as e:
-                logger.warning(f"Could not drop table {table}: {e}")
-    
-    def _create_categories_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the categories table.
-        
-        This table organizes products into logical groups.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE categories (
-            category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            category_name VARCHAR(100) NOT NULL UNIQUE,
-            description TEXT,
-            parent_category_id INTEGER,
-            is_active BOOLEAN DEFAULT TRUE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (parent_category_id) REFERENCES categories(category_id)
-        )
-        ''')
-        
-        logger.info("Created categories table")
-    
-    def _create_customers_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the customers table.
-        
-        This table stores all customer information.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE customers (
-            customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            first_name VARCHAR(50) NOT NULL,
-            last_name VARCHAR(50) NOT NULL,
-            email VARCHAR(100) UNIQUE NOT NULL,
-            phone VARCHAR(20),
-            password_hash VARCHAR(255),  -- In production, store hashed passwords
-            address TEXT,
-            city VARCHAR(50),
-            state VARCHAR(50),
-            zip_code VARCHAR(10),
-            country VARCHAR(50) DEFAULT 'USA',
-            date_of_birth DATE,
-            gender VARCHAR(10),
-            is_active BOOLEAN DEFAULT TRUE,
-            email_verified BOOLEAN DEFAULT FALSE,
-            loyalty_points INTEGER DEFAULT 0,
-            customer_type VARCHAR(20) DEFAULT 'regular',  -- regular, premium, vip
-            preferred_payment_method VARCHAR(50),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login_at TIMESTAMP,
-            
-            -- Indexes on commonly searched fields are created separately
-            CHECK (email LIKE '%@%'),  -- Basic email validation
-            CHECK (loyalty_points >= 0)  -- Points cannot be negative
+        # Views first, then tables, as one atomic script
+        return (
+            "BEGIN IMMEDIATE;\n"
+            + "\n".join(f"DROP VIEW IF EXISTS {view};" for view in views) + "\n"
+            + "\n".join(f"DROP TABLE IF EXISTS {table};" for table in tables)
+            + "\nCOMMIT;\n"
         )
-        ''')
-        
-        logger.info("Created customers table")
     
-    def _create_products_table(self, cursor: sqlite3.Cursor):
+    def create_indexes(self):
         """
-        Create the products table.
-        
-        This table stores all product information including inventory.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE products (
-            product_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_name VARCHAR(200) NOT NULL,
-            category_id INTEGER,
-            sku VARCHAR(50) UNIQUE,  -- Stock Keeping Unit
-            price DECIMAL(10, 2) NOT NULL,
-            cost DECIMAL(10, 2),  -- Cost to business (for profit calculations)
-            stock_quantity INTEGER DEFAULT 0,
-            reserved_quantity INTEGER DEFAULT 0,  -- Items in active carts
-            reorder_level INTEGER DEFAULT 10,  -- When to reorder
-            description TEXT,
-            brand VARCHAR(100),
-            weight DECIMAL(10, 3),  -- In kg
-            dimensions VARCHAR(50),  -- LxWxH format
-            color VARCHAR(50),
-            size VARCHAR(20),
-            material VARCHAR(100),
-            is_active BOOLEAN DEFAULT TRUE,
-            is_featured BOOLEAN DEFAULT FALSE,
-            discount_percentage DECIMAL(5, 2) DEFAULT 0,
-            tax_rate DECIMAL(5, 2) DEFAULT 0,
-            rating_average DECIMAL(3, 2) DEFAULT 0,  -- Average from reviews
-            rating_count INTEGER DEFAULT 0,
-            view_count INTEGER DEFAULT 0,  -- Product page views
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            launch_date DATE,
-            discontinue_date DATE,
-            
-            FOREIGN KEY (category_id) REFERENCES categories(category_id),
-            CHECK (price >= 0),
-            CHECK (stock_quantity >= 0),
-            CHECK (reserved_quantity >= 0),
-            CHECK (discount_percentage >= 0 AND discount_percentage <= 100),
-            CHECK (rating_average >= 0 AND rating_average <= 5)
-        )
-        ''')
-        
-        logger.info("Created products table")
-    
-    def _create_orders_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the orders table.
-        
-        This table stores order header information.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE orders (
-            order_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            customer_id INTEGER NOT NULL,
-            order_number VARCHAR(50) UNIQUE,  -- Human-readable order number
-            order_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            required_date DATE,  -- When customer needs the order
-            shipped_date TIMESTAMP,
-            delivered_date TIMESTAMP,
-            status VARCHAR(50) DEFAULT 'pending',  -- pending, confirmed, processing, shipped, delivered, cancelled, refunded
-            payment_status VARCHAR(50) DEFAULT 'pending',  -- pending, paid, failed, refunded
-            payment_method VARCHAR(50),  -- credit_card, debit_card, paypal, apple_pay, google_pay, bank_transfer
-            payment_transaction_id VARCHAR(100),
-            subtotal DECIMAL(10, 2),  -- Before tax and shipping
-            tax_amount DECIMAL(10, 2),
-            shipping_cost DECIMAL(10, 2),
-            discount_amount DECIMAL(10, 2),
-            total_amount DECIMAL(10, 2),  -- Final amount
-            currency VARCHAR(3) DEFAULT 'USD',
-            shipping_method VARCHAR(50),  -- standard, express, overnight
-            shipping_address TEXT,
-            shipping_city VARCHAR(50),
-            shipping_state VARCHAR(50),
-            shipping_zip VARCHAR(10),
-            shipping_country VARCHAR(50),
-            billing_address TEXT,
-            billing_city VARCHAR(50),
-            billing_state VARCHAR(50),
-            billing_zip VARCHAR(10),
-            billing_country VARCHAR(50),
-            tracking_number VARCHAR(100),
-            notes TEXT,  -- Customer notes
-            internal_notes TEXT,  -- Staff notes
-            ip_address VARCHAR(45),  -- For fraud detection
-            user_agent TEXT,  -- Browser info for analytics
-            referrer_source VARCHAR(100),  -- Where customer came from
-            coupon_code VARCHAR(50),
-            gift_message TEXT,
-            is_gift BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
-            CHECK (total_amount >= 0),
-            CHECK (status IN ('pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled', 'refunded')),
-            CHECK (payment_status IN ('pending', 'paid', 'failed', 'refunded'))
-        )
-        ''')
-        
-        logger.info("Created orders table")
-    
-    def _create_order_items_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the order_items table.
-        
-        This table stores individual line items for each order.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE order_items (
-            order_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            order_id INTEGER NOT NULL,
-            product_id INTEGER NOT NULL,
-            quantity INTEGER NOT NULL,
-            unit_price DECIMAL(10, 2) NOT NULL,  -- Price at time of purchase
-            discount_amount DECIMAL(10, 2) DEFAULT 0,
-            tax_amount DECIMAL(10, 2) DEFAULT 0,
-            subtotal DECIMAL(10, 2) NOT NULL,  -- quantity * unit_price - discount
-            total DECIMAL(10, 2) NOT NULL,  -- subtotal + tax
-            is_gift BOOLEAN DEFAULT FALSE,
-            gift_wrap BOOLEAN DEFAULT FALSE,
-            notes TEXT,
-            fulfillment_status VARCHAR(50) DEFAULT 'pending',  -- pending, packed, shipped, delivered
-            return_status VARCHAR(50),  -- requested, approved, received, refunded
-            return_reason TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            
-            FOREIGN KEY (order_id) REFERENCES orders(order_id) ON DELETE CASCADE,
-            FOREIGN KEY (product_id) REFERENCES products(product_id),
-            CHECK (quantity > 0),
-            CHECK (unit_price >= 0),
-            CHECK (subtotal >= 0)
-        )
-        ''')
-        
-        logger.info("Created order_items table")
-    
-    def _create_inventory_log_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the inventory_log table.
-        
-        This table tracks all inventory movements for audit purposes.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE inventory_log (
-            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_id INTEGER NOT NULL,
-            change_type VARCHAR(50) NOT NULL,  -- purchase, sale, return, adjustment, damage, theft
-            quantity_change INTEGER NOT NULL,  -- Positive for additions, negative for removals
-            quantity_before INTEGER NOT NULL,
-            quantity_after INTEGER NOT NULL,
-            reference_type VARCHAR(50),  -- order, return, adjustment, etc.
-            reference_id INTEGER,  -- ID of the related record
-            notes TEXT,
-            performed_by VARCHAR(100),  -- User who made the change
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            
-            FOREIGN KEY (product_id) REFERENCES products(product_id)
-        )
-        ''')
-        
-        logger.info("Created inventory_log table")
-    
-    def _create_product_reviews_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the product_reviews table.
-        
-        This table stores customer reviews and ratings for products.
-        
-        Args:
-            cursor: Database cursor
-        """
-        cursor.execute('''
-        CREATE TABLE product_reviews (
-            review_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            product_id INTEGER NOT NULL,
-            customer_id INTEGER NOT NULL,
-            order_id INTEGER,  -- Link to verified purchase
-            rating INTEGER NOT NULL,
-            title VARCHAR(200),
-            comment TEXT,
-            is_verified_purchase BOOLEAN DEFAULT FALSE,
-            is_recommended BOOLEAN DEFAULT TRUE,
-            helpful_count INTEGER DEFAULT 0,
-            not_helpful_count INTEGER DEFAULT 0,
-            is_featured BOOLEAN DEFAULT FALSE,
-            status VARCHAR(50) DEFAULT 'pending',  -- pending, approved, rejected
-            moderation_notes TEXT,
-            response_from_seller TEXT,
-            response_date TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            
-            FOREIGN KEY (product_id) REFERENCES products(product_id),
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
-            FOREIGN KEY (order_id) REFERENCES orders(order_id),
-            CHECK (rating >= 1 AND rating <= 5),
-            UNIQUE(product_id, customer_id, order_id)  -- One review per product per order
-        )
-        ''')
-        
-        logger.info("Created product_reviews table")
-    
-    def _create_cart_table(self, cursor: sqlite3.Cursor):
-        """
-        Create the cart and cart_items tables.
-        
-        These tables store shopping cart information for customers.
+        Create indexes for better query performance.
         
-        Args:
-            cursor: Database cursor
+        These indexes speed up common queries and joins. Call this after
+        seeding: building each index in one sorted pass over loaded data
+        is much cheaper than maintaining it on every insert.
         """
-        # Cart header table
-        cursor.execute('''
-        CREATE TABLE cart (
-            cart_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            customer_id INTEGER,
-            session_id VARCHAR(100),  -- For anonymous users
-            status VARCHAR(20) DEFAULT 'active',  -- active, abandoned, converted
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            expires_at TIMESTAMP,  -- When to clean up abandoned carts
-            
-            FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
-            CHECK (customer_id IS NOT NULL OR session_id IS NOT NULL)  -- Must have either customer or session
-        )
-        ''')
-        
-        # Cart items table
-        cursor.execute('''
-        CREATE TABLE cart_items (
-            cart_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            cart_id INTEGER NOT NULL,
-            product_id INTEGER NOT NULL,
-            quantity INTEGER NOT NULL DEFAULT 1,
-            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            saved_for_later BOOLEAN DEFAULT FALSE,
-            
-            FOREIGN KEY (cart_id) REFERENCES cart(cart_id) ON DELETE CASCADE,
-            FOREIGN KEY (product_id) REFERENCES products(product_id),
-            CHECK (quantity > 0),
-            UNIQUE(cart_id, product_id)  -- One entry per product per cart
+        inactive_orders = (
+            f"{status_id('order_status', 'cancelled')}, "
+            f"{status_id('order_status', 'refunded')}"
         )
-        ''')
         
-        logger.info("Created cart and cart_items tables")
-    
-    def _create_indexes(self, cursor: sqlite3.Cursor):
-        """
-        Create indexes for better query performance.
-        
-        These indexes speed up common queries and joins.
-        
-        Args:
-            cursor: Database cursor
-        """
         indexes = [
             # Customer indexes
-            "CREATE INDEX idx_customers_email ON customers(email)",
-            "CREATE INDEX idx_customers_phone ON customers(phone)",
-            "CREATE INDEX idx_customers_city_state ON customers(city, state)",
-            "CREATE INDEX idx_customers_created_at ON customers(created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email);",
+            "CREATE INDEX IF NOT EXISTS idx_customers_phone ON customers(phone);",
+            "CREATE INDEX IF NOT EXISTS idx_customers_city_state ON customers(city, state);",
+            "CREATE INDEX IF NOT EXISTS idx_customers_created_at ON customers(created_at);",
             
             # Product indexes
-            "CREATE INDEX idx_products_category ON products(category_id)",
-            "CREATE INDEX idx_products_brand ON products(brand)",
-            "CREATE INDEX idx_products_sku ON products(sku)",
-            "CREATE INDEX idx_products_price ON products(price)",
-            "CREATE INDEX idx_products_stock ON products(stock_quantity)",
-            "CREATE INDEX idx_products_active ON products(is_active)",
-            "CREATE INDEX idx_products_featured ON products(is_featured)",
-            "CREATE INDEX idx_products_rating ON products(rating_average DESC)",
+            "CREATE INDEX IF NOT EXISTS idx_products_category ON products(category_id);",
+            "CREATE INDEX IF NOT EXISTS idx_products_brand ON products(brand);",
+            "CREATE INDEX IF NOT EXISTS idx_products_sku ON products(sku);",
+            "CREATE INDEX IF NOT EXISTS idx_products_price ON products(price);",
+            "CREATE INDEX IF NOT EXISTS idx_products_stock ON products(stock_quantity);",
+            "CREATE INDEX IF NOT EXISTS idx_products_active ON products(is_active);",
+            "CREATE INDEX IF NOT EXISTS idx_products_featured ON products(is_featured);",
+            "CREATE INDEX IF NOT EXISTS idx_products_rating ON products(rating_average DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_products_lowstock ON products(available_quantity) WHERE is_active = 1 AND available_quantity <= reorder_level;",
             
             # Order indexes
-            "CREATE INDEX idx_orders_customer ON orders(customer_id)",
-            "CREATE INDEX idx_orders_date ON orders(order_date)",
-            "CREATE INDEX idx_orders_status ON orders(status)",
-            "CREATE INDEX idx_orders_payment_status ON orders(payment_status)",
-            "CREATE INDEX idx_orders_number ON orders(order_number)",
+            "CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(order_date);",
+            "CREATE INDEX IF NOT EXISTS idx_orders_payment_status ON orders(payment_status_id);",
+            "CREATE INDEX IF NOT EXISTS idx_orders_number ON orders(order_number);",
+            
+            # Covering indexes for the summary queries (also serve lookups
+            # by customer_id and status, replacing the single-column indexes)
+            "CREATE INDEX IF NOT EXISTS idx_orders_cust_status_total ON orders(customer_id, status_id, total_amount, order_date);",
+            f"CREATE INDEX IF NOT EXISTS idx_orders_active ON orders(order_date, total_amount) WHERE status_id NOT IN ({inactive_orders});",
             
-            # Order items indexes
-            "CREATE INDEX idx_order_items_order ON order_items(order_id)",
-            "CREATE INDEX idx_order_items_product ON order_items(product_id)",
+            # Order items indexes (the covering index also serves lookups
+            # by product_id, replacing the single-column index)
+            "CREATE INDEX IF NOT EXISTS idx_order_items_prod_qty_total ON order_items(product_id, quantity, total);",
             
             # Review indexes
-            "CREATE INDEX idx_reviews_product ON product_reviews(product_id)",
-            "CREATE INDEX idx_reviews_customer ON product_reviews(customer_id)",
-            "CREATE INDEX idx_reviews_rating ON product_reviews(rating)",
-            "CREATE INDEX idx_reviews_status ON product_reviews(status)",
+            "CREATE INDEX IF NOT EXISTS idx_reviews_product ON product_reviews(product_id);",
+            "CREATE INDEX IF NOT EXISTS idx_reviews_customer ON product_reviews(customer_id);",
+            "CREATE INDEX IF NOT EXISTS idx_reviews_rating ON product_reviews(rating);",
+            "CREATE INDEX IF NOT EXISTS idx_reviews_status ON product_reviews(status_id);",
             
             # Cart indexes
-            "CREATE INDEX idx_cart_customer ON cart(customer_id)",
-            "CREATE INDEX idx_cart_session ON cart(session_id)",
-            "CREATE INDEX idx_cart_status ON cart(status)",
+            "CREATE INDEX IF NOT EXISTS idx_cart_customer ON cart(customer_id);",
+            "CREATE INDEX IF NOT EXISTS idx_cart_session ON cart(session_id);",
+            "CREATE INDEX IF NOT EXISTS idx_cart_status ON cart(status_id);",
             
             # Inventory log indexes
-            "CREATE INDEX idx_inventory_log_product ON inventory_log(product_id)",
-            "CREATE INDEX idx_inventory_log_date ON inventory_log(created_at)",
-            "CREATE INDEX idx_inventory_log_type ON inventory_log(change_type)"
+            "CREATE INDEX IF NOT EXISTS idx_inventory_log_product ON inventory_log(product_id);",
+            "CREATE INDEX IF NOT EXISTS idx_inventory_log_date ON inventory_log(created_at);",
+            "CREATE INDEX IF NOT EXISTS idx_inventory_log_type ON inventory_log(change_type);",
+            
+            # Materialized view indexes
+            "CREATE INDEX IF NOT EXISTS idx_customer_summary_mv_customer ON customer_summary_mv(customer_id);",
+            "CREATE INDEX IF NOT EXISTS idx_product_performance_mv_product ON product_performance_mv(product_id);",
+            "CREATE INDEX IF NOT EXISTS idx_low_stock_products_mv_product ON low_stock_products_mv(product_id);",
+            "CREATE INDEX IF NOT EXISTS idx_monthly_revenue_mv_month ON monthly_revenue_mv(month);"
         ]
         
         logger.info("Creating indexes...")
         
-        for index in indexes:
-            try:
-                cursor.execute(index)
-                index_name = index.split()[2]  # Extract index name
-                logger.debug(f"Created index: {index_name}")
-            except sqlite3.Error as e:
-                logger.warning(f"Could not create index: {e}")
+        with self._write_lock:
+            self._schema_cache = None
+            
+            # One atomic, idempotent batch: re-running only adds missing indexes
+            self.conn.executescript("BEGIN IMMEDIATE;\n" + "\n".join(indexes) + "\nCOMMIT;")
+        
+        logger.info("Ensured %d indexes exist", len(indexes))
     
-    def _create_views(self, cursor: sqlite3.Cursor):
+    def refresh_materialized_views(self):
         """
-        Create views for common queries.
+        Recompute every materialized view table from the base tables.
         
-        Views simplify complex queries and improve performance.
-        
-        Args:
-            cursor: Database cursor
+        Call this after bulk loads, or periodically when the summaries
+        need to reflect recent changes. All tables are refreshed in a
+        single transaction.
         """
-        # Customer summary view
-        cursor.execute('''
-        CREATE VIEW customer_summary AS
-        SELECT 
-            c.customer_id,
-            c.first_name || ' ' || c.last_name as full_name,
-            c.email,
-            c.customer_type,
-            COUNT(DISTINCT o.order_id) as total_orders,
-            COALESCE(SUM(o.total_amount), 0) as lifetime_value,
-            COALESCE(AVG(o.total_amount), 0) as avg_order_value,
-            MAX(o.order_date) as last_order_date,
-            c.created_at as customer_since
-        FROM customers c
-        LEFT JOIN orders o ON c.customer_id = o.customer_id AND o.status != 'cancelled'
-        GROUP BY c.customer_id
-        ''')
+        statements = []
+        for name, query in MATERIALIZED_VIEWS.items():
+            statements.append(f"DELETE FROM {name};")
+            statements.append(f"INSERT INTO {name} {query};")
         
-        logger.info("Created customer_summary view")
+        with self._write_lock:
+            self.conn.executescript("BEGIN IMMEDIATE;\n" + "\n".join(statements) + "\nCOMMIT;")
         
-        # Product performance view
-        cursor.execute('''
-        CREATE VIEW product_performance AS
-        SELECT 
-            p.product_id,
-            p.product_name,
-            p.brand,
-            c.category_name,
-            p.price,
-            p.stock_quantity,
-            COALESCE(SUM(oi.quantity), 0) as units_sold,
-            COALESCE(SUM(oi.total), 0) as revenue,
-            p.rating_average,
-            p.rating_count,
-            p.view_count
-        FROM products p
-        LEFT JOIN categories c ON p.category_id = c.category_id
-        LEFT JOIN order_items oi ON p.product_id = oi.product_id
-        LEFT JOIN orders o ON oi.order_id = o.order_id AND o.status != 'cancelled'
-        GROUP BY p.product_id
-        ''')
+        logger.info("Refreshed %d materialized views", len(MATERIALIZED_VIEWS))
+    
+    def analyze(self):
+        """
+        Gather planner statistics for the loaded data.
         
-        logger.info("Created product_performance view")
+        Call this once after seeding and create_indexes(). Without
+        sqlite_stat1 the planner has to guess table sizes for the
+        multi-table joins in the summary queries.
+        """
+        with self._write_lock:
+            self.conn.executescript("ANALYZE;\nPRAGMA optimize;")
         
-        # Low stock products view
-        cursor.execute('''
-        CREATE VIEW low_stock_products AS
-        SELECT 
-            p.product_id,
-            p.product_name,
-            p.sku,
-            p.stock_quantity,
-            p.reserved_quantity,
-            p.reorder_level,
-            (p.stock_quantity - p.reserved_quantity) as available_quantity,
-            c.category_name
-        FROM products p
-        LEFT JOIN categories c ON p.category_id = c.category_id
-        WHERE p.is_active = TRUE 
-        AND (p.stock_quantity - p.reserved_quantity) <= p.reorder_level
-        ORDER BY (p.stock_quantity - p.reserved_quantity) ASC
-        ''')
+        logger.info("Database statistics updated")
+    
+    def backup(self, target_path: str):
+        """
+        Copy the whole database into a file.
         
-        logger.info("Created low_stock_products view")
+        Lets a database built and seeded in ':memory:' be written out with
+        one sequential page copy instead of journaled page-by-page writes.
+        Any existing database at target_path is replaced.
         
-        # Monthly revenue view
-        cursor.execute('''
-        CREATE VIEW monthly_revenue AS
-        SELECT 
-            strftime('%Y-%m', order_date) as month,
-            COUNT(DISTINCT order_id) as total_orders,
-            COUNT(DISTINCT customer_id) as unique_customers,
-            SUM(total_amount) as revenue,
-            AVG(total_amount) as avg_order_value
-        FROM orders
-        WHERE status NOT IN ('cancelled', 'refunded')
-        GROUP BY strftime('%Y-%m', order_date)
-        ORDER BY month DESC
-        ''')
+        Args:
+            target_path: Path of the database file to write
+        """
+        if os.path.dirname(target_path):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        
+        target = sqlite3.connect(target_path)
+        try:
+            # SQLite refuses to back up into a WAL database whose page size
+            # differs from the source, so an existing target leaves WAL first
+            target.execute("PRAGMA journal_mode = DELETE")
+            
+            with self._write_lock:
+                self.conn.backup(target)
+            
+            # The copied header carries the source's journal mode
+            target.execute("PRAGMA journal_mode = WAL")
+        finally:
+            target.close()
         
-        logger.info("Created monthly_revenue view")
+        logger.info("Database copied to %s", target_path)
     
     def _verify_schema(self, cursor: sqlite3.Cursor):
         """
@@ -651,56 +794,65 @@ class DatabaseCreator:
         expected_tables = [
             'cart', 'cart_items', 'categories', 'customers',
             'inventory_log', 'order_items', 'orders',
-            'product_reviews', 'products'
+            'product_reviews', 'products',
+            *STATUS_LOOKUPS,
+            *MATERIALIZED_VIEWS
         ]
         
+        found_tables = []
         for expected_table in expected_tables:
             if expected_table not in table_names:
-                logger.warning(f"Expected table '{expected_table}' not found in schema")
+                logger.warning("Expected table '%s' not found in schema", expected_table)
             else:
-                # Get row count for each table
-                cursor.execute(f"SELECT COUNT(*) FROM {expected_table}")
-                count = cursor.fetchone()[0]
-                logger.info(f"Table '{expected_table}' created successfully (rows: {count})")
+                found_tables.append(expected_table)
+        
+        if not found_tables:
+            return
+        
+        # Get row counts for all tables in one query (the names come from
+        # the hard-coded list above, never from input)
+        cursor.execute(" UNION ALL ".join(
+            f"SELECT '{table}', (SELECT COUNT(*) FROM {table})"
+            for table in found_tables
+        ))
+        for table, count in cursor.fetchall():
+            logger.info("Table '%s' created successfully (rows: %d)", table, count)
     
     def get_schema_info(self) -> dict:
         """
         Get detailed information about the database schema.
         
+        Columns, foreign keys and indexes for every table are read with
+        three queries over the pragma table-valued functions. The result
+        is cached until the schema is rebuilt or indexes are added; each
+        call returns its own copy, so callers cannot alter the cache.
+        
         Returns:
             Dictionary containing schema information
         """
+        if self._schema_cache is not None:
+            return copy.deepcopy(self._schema_cache)
+        
         if not self.conn:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = self._connect()
         
         cursor = self.conn.cursor()
         schema_info = {}
         
-        # Get all tables
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' 
-            ORDER BY name
-        """)
-        
-        tables = cursor.fetchall()
+        tables_sql = """
+            FROM sqlite_master m JOIN {pragma}(m.name) p
+            WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+            AND m.name NOT IN (SELECT name FROM pragma_table_list WHERE type = 'shadow')
+        """
         
-        for table_name in [t[0] for t in tables]:
-            if table_name.startswith('sqlite_'):
-                continue
-                
-            # Get column information
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-            
-            # Get foreign keys
-            cursor.execute(f"PRAGMA foreign_key_list({table_name})")
-            foreign_keys = cursor.fetchall()
-            
-            # Get indexes
-            cursor.execute(f"PRAGMA index_list({table_name})")
-            indexes = cursor.fetchall()
-            
+        # Get column information for all tables (table_xinfo also lists
+        # generated columns; hidden = 1 marks virtual-table internals)
+        cursor.execute(
+            'SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk '
+            + tables_sql.format(pragma='pragma_table_xinfo')
+            + " AND p.hidden != 1 ORDER BY m.name, p.cid"
+        )
+        for table_name, columns in groupby(cursor.fetchall(), key=itemgetter(0)):
             schema_info[table_name] = {
                 'columns': [
                     {
@@ -712,23 +864,42 @@ class DatabaseCreator:
                     }
                     for col in columns
                 ],
-                'foreign_keys': [
-                    {
-                        'column': fk[3],
-                        'references_table': fk[2],
-                        'references_column': fk[4]
-                    }
-                    for fk in foreign_keys
-                ],
-                'indexes': [idx[1] for idx in indexes]
+                'foreign_keys': [],
+                'indexes': []
             }
         
-        return schema_info
+        # Get foreign keys for all tables
+        cursor.execute(
+            'SELECT m.name, p."from", p."table", p."to" '
+            + tables_sql.format(pragma='pragma_foreign_key_list')
+            + " ORDER BY m.name, p.id, p.seq"
+        )
+        for table_name, column, references_table, references_column in cursor.fetchall():
+            schema_info[table_name]['foreign_keys'].append({
+                'column': column,
+                'references_table': references_table,
+                'references_column': references_column
+            })
+        
+        # Get indexes for all tables
+        cursor.execute(
+            "SELECT m.name, p.name "
+            + tables_sql.format(pragma='pragma_index_list')
+            + " ORDER BY m.name, p.seq"
+        )
+        for table_name, index_name in cursor.fetchall():
+            schema_info[table_name]['indexes'].append(index_name)
+        
+        self._schema_cache = schema_info
+        return copy.deepcopy(schema_info)
     
     def close(self):
         """Close the database connection."""
         if self.conn:
+            # Refresh any planner statistics that went stale this session
+            self.conn.execute("PRAGMA optimize")
             self.conn.close()
+            self.conn = None
             logger.info("Database connection closed")
     
     def __enter__(self):
@@ -744,9 +915,11 @@ def main():
     """
     Main function to create the database when running this module directly.
     """
+    logging.basicConfig(level=logging.INFO)
+    
     # Create the database
     with DatabaseCreator() as creator:
-        conn = creator.create_database()
+        conn = creator.create_database(defer_indexes=False)
         schema_info = creator.get_schema_info()
         
         print("\n" + "="*50)
@@ -1,102 +1,344 @@
 import sqlite3
 import json
+import os
+import copy
+import filecmp
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import lru_cache
 
-def extract_schema_info():
+DB_PATH = 'ecommerce.db'
+SCHEMA_INFO_PATH = 'schema_info.json'
+SCHEMA_DESCRIPTION_PATH = 'schema_description.txt'
+
+class _LazySamples(Sequence):
+    """
+    Sample rows of one table, turned into dicts only when first accessed
+    """
+    __slots__ = ('_column_names', '_rows', '_dicts')
+    
+    def __init__(self, column_names, rows):
+        self._column_names = column_names
+        self._rows = rows
+        self._dicts = None
+    
+    @classmethod
+    def from_dicts(cls, dicts):
+        """
+        Wraps sample rows that are already column -> value dicts
+        """
+        samples = cls(None, None)
+        samples._dicts = dicts
+        return samples
+    
+    def materialize(self):
+        """
+        Returns the sample rows as a list of column -> value dicts
+        """
+        if self._dicts is None:
+            self._dicts = [dict(zip(self._column_names, row)) for row in self._rows]
+            self._rows = None
+        return self._dicts
+    
+    def __getitem__(self, index):
+        return self.materialize()[index]
+    
+    def __len__(self):
+        return len(self._rows if self._dicts is None else self._dicts)
+    
+    def __eq__(self, other):
+        return self.materialize() == other
+    
+    def __repr__(self):
+        return repr(self.materialize())
+
+def _json_default(obj):
+    """
+    Serializes lazy sample rows and BLOB sample values
+    """
+    if isinstance(obj, _LazySamples):
+        return obj.materialize()
+    if isinstance(obj, bytes):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# Shared encoder for schema_info.json. Sample values are SQLite's own
+# types, so only lazy sample lists and BLOBs need the default= hook
+_JSON_ENCODER = json.JSONEncoder(indent=2, default=_json_default)
+
+# Column suffixes in the description, indexed by the primary_key,
+# nullable and generated flags
+_PRIMARY_KEY_LABELS = ("", " (PRIMARY KEY)")
+_NULLABLE_LABELS = (" (NOT NULL)", " (NULLABLE)")
+_GENERATED_LABELS = ("", " (GENERATED)")
+
+def _db_mtime():
+    """
+    Returns the last modification time of the database, including its WAL file
+    """
+    mtime = os.path.getmtime(DB_PATH)
+    wal_path = DB_PATH + '-wal'
+    if os.path.exists(wal_path):
+        mtime = max(mtime, os.path.getmtime(wal_path))
+    return mtime
+
+def _is_fresh(path, db_mtime):
+    """
+    Checks whether a generated file is at least as new as the database
+    """
+    return os.path.exists(path) and os.path.getmtime(path) >= db_mtime
+
+def _tune_ro(conn, cache_size_kib=65536, mmap_size=268435456):
+    """
+    Applies read-only analytics PRAGMAs to a connection
+    
+    query_only makes any write through the connection fail; the rest give
+    it a large page cache, memory-mapped I/O and in-memory temp storage.
+    synchronous and journal_mode are left alone: they only affect writes.
+    """
+    conn.executescript(f"""
+        PRAGMA query_only = 1;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA mmap_size = {int(mmap_size)};
+        PRAGMA cache_size = -{int(cache_size_kib)};
+    """)
+
+def _write_if_changed(path, chunks):
+    """
+    Writes text chunks to a file unless the file already holds exactly that text
+    
+    The chunks are streamed into a temporary file, so the full text never has
+    to exist in memory at once. If the result matches the current file, the
+    temporary file is dropped and the current one only touched, so its mtime
+    still marks it fresh against the database; otherwise it atomically
+    replaces the current file. Returns True if the content was written.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+        os.utime(path)
+        return False
+    
+    os.replace(tmp_path, path)
+    return True
+
+def _quote_identifier(name):
+    """
+    Quotes a table or column name for use in SQL text
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+def extract_schema_info(include_samples=True, include_fks=True):
     """
     Extracts detailed schema information for the agent to understand
+    
+    Results are cached in 'schema_info.json' and in memory, and are only
+    re-extracted when the database has been modified since. Callers that
+    do not need sample rows or foreign keys can skip reading them; their
+    lists are then left empty. Each call returns its own copy, so callers
+    may modify the result without affecting the cache. Without a database
+    file there is no schema, and an empty dict is returned.
+    """
+    # A read-only connection cannot create the file, so don't try to open it
+    if not os.path.exists(DB_PATH):
+        return {}
+    return copy.deepcopy(_cached_schema_info(_db_mtime(), include_samples, include_fks))
+
+@lru_cache(maxsize=8)
+def _cached_schema_info(db_mtime, include_samples, include_fks):
+    """
+    Returns the schema information for one version (mtime) of the database
     """
-    conn = sqlite3.connect('ecommerce.db')
+    if _is_fresh(SCHEMA_INFO_PATH, db_mtime):
+        with open(SCHEMA_INFO_PATH, encoding='utf-8') as f:
+            schema_info = json.load(f)
+        # Wrap the loaded rows so sample_data has the same type as on a
+        # fresh extraction
+        for info in schema_info.values():
+            info['sample_data'] = _LazySamples.from_dicts(
+                info['sample_data'] if include_samples else []
+            )
+            if not include_fks:
+                info['foreign_keys'] = []
+        return schema_info
+    return _extract_schema_info(include_samples, include_fks)
+
+def _extract_schema_info(include_samples=True, include_fks=True):
+    """
+    Reads the schema information from the database
+    
+    The full result (samples and foreign keys included) is also saved to
+    'schema_info.json'; partial results are not, so the file stays complete.
+    """
+    # This pass only reads, so open the database read-only and tune the
+    # connection for reading. The same cursor is reused for every query below
+    conn = sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True, isolation_level=None)
+    _tune_ro(conn)
     cursor = conn.cursor()
     
-    # Get all table names
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = cursor.fetchall()
+    # Read everything inside one explicit transaction (isolation_level=None
+    # leaves transaction control to us) so the whole pass sees a single
+    # snapshot and takes the shared lock only once
+    cursor.execute("BEGIN")
+    
+    # Get all table names. SQLite's own tables and FTS shadow tables are
+    # internal storage, and the FTS virtual tables are search indexes over
+    # tables that are already listed
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table'
+        AND name NOT LIKE 'sqlite_%'
+        AND name NOT IN (
+            SELECT name FROM pragma_table_list WHERE type IN ('shadow', 'virtual')
+        )
+    """)
+    tables = [name for (name,) in cursor]
+    
+    # Get column information for every table in one query. table_xinfo
+    # also lists generated columns (hidden 2 or 3), which queries can read
+    # like any other column; hidden 1 marks virtual-table internals
+    columns_by_table = defaultdict(list)
+    cursor.execute("""
+        SELECT m.name, p.name, p.type, p."notnull", p.pk, p.hidden > 1
+        FROM sqlite_master m, pragma_table_xinfo(m.name) p
+        WHERE m.type='table' AND p.hidden != 1
+        ORDER BY m.name, p.cid
+    """)
+    for table_name, *column in cursor:
+        columns_by_table[table_name].append(column)
+    
+    # Get foreign key information for every table in one query
+    foreign_keys_by_table = defaultdict(list)
+    if include_fks:
+        cursor.execute("""
+            SELECT m.name, p."from", p."table", p."to"
+            FROM sqlite_master m, pragma_foreign_key_list(m.name) p
+            WHERE m.type='table'
+            ORDER BY m.name, p.id, p.seq
+        """)
+        for table_name, *fk in cursor:
+            foreign_keys_by_table[table_name].append(fk)
+    
+    # Get sample data (3 rows per table) on the same cursor and snapshot.
+    # Rows keep SQLite's native values, so REALs keep full precision and
+    # BLOBs come back as bytes; names are quoted, never spliced in raw
+    sample_columns_by_table = defaultdict(list)
+    sample_rows_by_table = defaultdict(list)
+    if include_samples:
+        for table_name in tables:
+            cursor.execute(f"SELECT * FROM {_quote_identifier(table_name)} LIMIT 3")
+            sample_columns_by_table[table_name] = [col[0] for col in cursor.description]
+            sample_rows_by_table[table_name] = cursor.fetchall()
+    
+    cursor.execute("COMMIT")
+    conn.close()
     
     schema_info = {}
     
-    for table in tables:
-        table_name = table[0]
-        
-        # Get column information
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = cursor.fetchall()
-        
-        # Get foreign key information
-        cursor.execute(f"PRAGMA foreign_key_list({table_name})")
-        foreign_keys = cursor.fetchall()
+    for table_name in tables:
+        columns = columns_by_table[table_name]
+        foreign_keys = foreign_keys_by_table[table_name]
         
         schema_info[table_name] = {
-            'columns': [],
-            'foreign_keys': [],
+            # Process columns
+            'columns': [
+                {
+                    'name': name,
+                    'type': col_type,
+                    'nullable': not notnull,
+                    'primary_key': bool(pk),
+                    'generated': bool(generated)
+                }
+                for name, col_type, notnull, pk, generated in columns
+            ],
+            # Process foreign keys
+            'foreign_keys': [
+                {
+                    'column': column,
+                    'references_table': references_table,
+                    'references_column': references_column
+                }
+                for column, references_table, references_column in foreign_keys
+            ],
             'sample_data': []
         }
         
-        # Process columns
-        for col in columns:
-            schema_info[table_name]['columns'].append({
-                'name': col[1],
-                'type': col[2],
-                'nullable': not col[3],
-                'primary_key': bool(col[5])
-            })
-        
-        # Process foreign keys
-        for fk in foreign_keys:
-            schema_info[table_name]['foreign_keys'].append({
-                'column': fk[3],
-                'references_table': fk[2],
-                'references_column': fk[4]
-            })
-        
-        # Get sample data (3 rows)
-        cursor.execute(f"SELECT * FROM {table_name} LIMIT 3")
-        sample_rows = cursor.fetchall()
-        column_names = [col[0] for col in cursor.description]
-        
-        for row in sample_rows:
-            schema_info[table_name]['sample_data'].append(
-                dict(zip(column_names, row))
-            )
-    
-    conn.close()
+        # Process sample data; the row dicts are only built if used
+        schema_info[table_name]['sample_data'] = _LazySamples(
+            sample_columns_by_table[table_name],
+            sample_rows_by_table[table_name]
+        )
     
     # Save schema information to JSON file
-    with open('schema_info.json', 'w') as f:
-        json.dump(schema_info, f, indent=2, default=str)
+    if include_samples and include_fks:
+        # Stream the encoder's output instead of building the whole JSON string
+        if _write_if_changed(SCHEMA_INFO_PATH, _JSON_ENCODER.iterencode(schema_info)):
+            print(f"Schema information saved to '{SCHEMA_INFO_PATH}'")
     
-    print("Schema information saved to 'schema_info.json'")
     return schema_info
 
 def generate_schema_description():
     """
     Generates a human-readable schema description for the LLM
+    
+    The description is kept in memory and in 'schema_description.txt', and
+    is only rebuilt when the database has been modified since.
     """
-    schema_info = extract_schema_info()
+    if not os.path.exists(DB_PATH):
+        return _build_schema_description()
+    return _cached_description(_db_mtime())
+
+@lru_cache(maxsize=4)
+def _cached_description(db_mtime):
+    """
+    Returns the schema description for one version (mtime) of the database
+    """
+    if _is_fresh(SCHEMA_DESCRIPTION_PATH, db_mtime):
+        with open(SCHEMA_DESCRIPTION_PATH, encoding='utf-8') as f:
+            return f.read()
+    return _build_schema_description()
+
+def _build_schema_description():
+    """
+    Builds the schema description from the database and saves it to text
+    """
+    # The description lists columns and foreign keys only
+    schema_info = extract_schema_info(include_samples=False)
     
-    description = "E-COMMERCE DATABASE SCHEMA:\n\n"
+    # Collect fragments and join once; += on a str copies the whole text
+    parts = ["E-COMMERCE DATABASE SCHEMA:\n\n"]
     
     for table_name, info in schema_info.items():
-        description += f"TABLE: {table_name}\n"
-        description += "Columns:\n"
+        parts.append(f"TABLE: {table_name}\nColumns:\n")
         
-        for col in info['columns']:
-            pk = " (PRIMARY KEY)" if col['primary_key'] else ""
-            nullable = " (NULLABLE)" if col['nullable'] else " (NOT NULL)"
-            description += f"  - {col['name']}: {col['type']}{pk}{nullable}\n"
+        # One format per column; the suffixes are picked by flag, not branched on.
+        # schema_info.json files from before the generated flag lack it
+        parts.extend(
+            f"  - {col['name']}: {col['type']}"
+            f"{_PRIMARY_KEY_LABELS[col['primary_key']]}{_NULLABLE_LABELS[col['nullable']]}"
+            f"{_GENERATED_LABELS[col.get('generated', False)]}\n"
+            for col in info['columns']
+        )
         
         if info['foreign_keys']:
-            description += "Foreign Keys:\n"
-            for fk in info['foreign_keys']:
-                description += f"  - {fk['column']} → {fk['references_table']}.{fk['references_column']}\n"
+            parts.append("Foreign Keys:\n")
+            parts.extend(
+                f"  - {fk['column']} → {fk['references_table']}.{fk['references_column']}\n"
+                for fk in info['foreign_keys']
+            )
         
-        description += "\n"
+        parts.append("\n")
     
-    # Save to text file
-    with open('schema_description.txt', 'w') as f:
-        f.write(description)
+    description = "".join(parts)
     
-    print("Schema description saved to 'schema_description.txt'")
+    # Save to text file
+    if _write_if_changed(SCHEMA_DESCRIPTION_PATH, parts):
+        print(f"Schema description saved to '{SCHEMA_DESCRIPTION_PATH}'")
     return description
 
 if __name__ == "__main__":
-    generate_schema_description()
\ No newline at end of file
+    generate_schema_description()
@@ -10,12 +10,172 @@ from datetime import datetime, timedelta, date
 from typing import List, Dict, Any, Optional, Tuple
 import hashlib
 import json
+from functools import wraps
+from itertools import repeat
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Bulk write statements, shared by every executemany call so each is prepared once
+_INSERT_CUSTOMER = '''
+    INSERT INTO customers (
+        first_name, last_name, email, phone, password_hash,
+        address, city, state, zip_code, country,
+        date_of_birth, gender, loyalty_points, customer_type,
+        preferred_payment_method, created_at, last_login_at,
+        email_verified, is_active
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_PRODUCT = '''
+    INSERT INTO products (
+        product_name, category_id, sku, price, cost,
+        stock_quantity, reserved_quantity, reorder_level,
+        description, brand, weight, dimensions,
+        color, size, material,
+        is_active, is_featured, discount_percentage, tax_rate,
+        rating_average, rating_count, view_count,
+        launch_date
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_ORDER = '''
+    INSERT INTO orders (
+        order_id, customer_id, order_number, order_date, required_date,
+        shipped_date, delivered_date, status_id, payment_status_id,
+        payment_method, shipping_method, shipping_cost,
+        shipping_address, shipping_city, shipping_state,
+        shipping_zip, shipping_country,
+        billing_address, billing_city, billing_state,
+        billing_zip, billing_country,
+        tracking_number, subtotal, tax_amount,
+        discount_amount, total_amount
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_ORDER_ITEM = '''
+    INSERT INTO order_items (
+        order_id, product_id, quantity, unit_price,
+        discount_amount, tax_amount, subtotal, total,
+        fulfillment_status_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# OR IGNORE lets the UNIQUE(product_id, customer_id, order_id) constraint
+# drop reviews that already exist instead of failing the batch
+_INSERT_REVIEW = '''
+    INSERT OR IGNORE INTO product_reviews (
+        product_id, customer_id, order_id, rating,
+        title, comment, is_verified_purchase, is_recommended,
+        helpful_count, not_helpful_count, status_id, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_CART = '''
+    INSERT INTO cart (cart_id, customer_id, session_id, status_id, created_at, updated_at, expires_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_CART_ITEM = '''
+    INSERT INTO cart_items (cart_id, product_id, quantity, saved_for_later, added_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_RESERVE_STOCK = '''
+    UPDATE products
+    SET reserved_quantity = reserved_quantity + ?
+    WHERE product_id = ?
+'''
+
+_INSERT_INVENTORY_LOG = '''
+    INSERT INTO inventory_log (
+        product_id, change_type, quantity_change,
+        quantity_before, quantity_after, notes,
+        performed_by, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def _randints(low: int, high: int, k: int) -> List[int]:
+    """
+    Draw k random integers in [low, high] in a single call.
+    
+    Args:
+        low: Smallest value, inclusive
+        high: Largest value, inclusive
+        k: Number of values to draw
+        
+    Returns:
+        List of k integers
+    """
+    return random.choices(range(low, high + 1), k=k)
+
+
+def _bernoulli(p: float, k: int) -> List[bool]:
+    """
+    Draw k independent flags that are each True with probability p.
+    
+    Args:
+        p: Probability of True
+        k: Number of flags to draw
+        
+    Returns:
+        List of k booleans
+    """
+    draw = random.random
+    return [draw() < p for _ in range(k)]
+
+
+def _day_stamps(anchor, first: int, last: int) -> Dict[int, str]:
+    """
+    Format an anchor date or datetime shifted back by each whole-day offset.
+    
+    Seed dates fall on a small range of day offsets, so formatting each one
+    once replaces a timedelta and a sqlite3 adapter call per row.
+    
+    Args:
+        anchor: date or datetime the offsets count back from
+        first: Smallest offset in days (negative for future dates)
+        last: Largest offset in days, inclusive
+        
+    Returns:
+        Dict mapping each offset to the stamp as sqlite3 would store it
+    """
+    return {days: str(anchor - timedelta(days=days)) for days in range(first, last + 1)}
+
+
+def _in_transaction(method):
+    """
+    Run a populate_* method in a single transaction of its own.
+    
+    Inside populate_all the method joins the transaction already open, so
+    the decorator only begins and commits when called on its own.
+    
+    Args:
+        method: Seeder method to wrap
+        
+    Returns:
+        The wrapped method
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.conn.in_transaction:
+            return method(self, *args, **kwargs)
+        
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            result = method(self, *args, **kwargs)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return result
+    
+    return wrapper
+
+
 class DatabaseSeeder:
     """
     Handles population of the e-commerce database with sample data.
@@ -40,11 +200,47 @@ class DatabaseSeeder:
         self.product_ids = []
         self.order_ids = []
         
+        # Status name -> id maps, loaded from the lookup tables on first use
+        self._status_ids: Dict[str, Dict[str, int]] = {}
+        
         # Random seed for reproducibility (optional)
         random.seed(42)
         
         logger.info("DatabaseSeeder initialized")
     
+    def _status_id(self, lookup: str, name: str) -> int:
+        """
+        Get the id of a status name from one of the status lookup tables.
+        
+        Args:
+            lookup: Lookup table name, e.g. 'order_status'
+            name: Status name, e.g. 'delivered'
+            
+        Returns:
+            The matching status_id
+        """
+        if lookup not in self._status_ids:
+            self.cursor.execute(f"SELECT name, status_id FROM {lookup}")
+            self._status_ids[lookup] = dict(self.cursor.fetchall())
+        return self._status_ids[lookup][name]
+    
+    def _next_id(self, table: str, id_column: str) -> int:
+        """
+        Get the id the next row inserted into a table will receive.
+        
+        IDs are INTEGER PRIMARY KEY aliases of the rowid, so inside the seeding
+        transaction a batch of n inserts takes exactly the next n ids.
+        
+        Args:
+            table: Table name
+            id_column: Its INTEGER PRIMARY KEY column
+            
+        Returns:
+            One past the current largest id
+        """
+        self.cursor.execute(f"SELECT COALESCE(MAX({id_column}), 0) FROM {table}")
+        return self.cursor.fetchone()[0] + 1
+    
     def populate_all(self, 
                     num_customers: int = 100,
                     num_products: int = 200,
@@ -59,7 +255,42 @@ class DatabaseSeeder:
         """
         logger.info("Starting database population...")
         
+        # Generated data is consistent by construction, so foreign keys are
+        # checked once after loading instead of on every insert
+        self.cursor.execute("PRAGMA foreign_keys")
+        foreign_keys = self.cursor.fetchone()[0]
+        
+        # The larger load-time page cache is handed back afterwards
+        self.cursor.execute("PRAGMA cache_size")
+        cache_size = self.cursor.fetchone()[0]
+        
+        # Manage the transaction explicitly and make sure no per-statement or
+        # per-opcode callbacks fire during the load
+        isolation_level = self.conn.isolation_level
+        self.conn.isolation_level = None
+        self.conn.set_authorizer(None)
+        self.conn.set_progress_handler(None, 0)
+        self.conn.set_trace_callback(None)
+        
         try:
+            # Bulk-load settings; journal_mode and foreign_keys can only
+            # change outside a transaction. A crash mid-load is recovered by
+            # seeding again, so the load itself skips fsyncs
+            self.cursor.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=OFF;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-131072;
+                PRAGMA mmap_size=268435456;
+                PRAGMA foreign_keys=OFF;
+            ''')
+            
+            # Load everything in one explicit transaction
+            self.cursor.execute("BEGIN IMMEDIATE")
+            
+            # Indexes are rebuilt in one pass after loading
+            index_ddl = self._drop_secondary_indexes()
+            
             # Order matters due to foreign key constraints
             self.populate_categories()
             self.populate_customers(num_customers)
@@ -69,6 +300,17 @@ class DatabaseSeeder:
             self.populate_carts()
             self.populate_inventory_logs()
             
+            for sql in index_ddl:
+                self.cursor.execute(sql)
+            
+            self.cursor.execute("PRAGMA foreign_key_check")
+            violations = self.cursor.fetchall()
+            if violations:
+                raise sqlite3.IntegrityError(
+                    f"Seeded data has {len(violations)} foreign key violations, "
+                    f"first in table {violations[0][0]}"
+                )
+            
             # Commit all changes
             self.conn.commit()
             
@@ -81,7 +323,39 @@ class DatabaseSeeder:
             logger.error(f"Error populating database: {e}")
             self.conn.rollback()
             raise
+        
+        finally:
+            # Durable settings for normal use of the database
+            self.cursor.executescript(f'''
+                PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size={cache_size};
+                PRAGMA foreign_keys={foreign_keys};
+            ''')
+            self.conn.isolation_level = isolation_level
     
+    def _drop_secondary_indexes(self) -> List[str]:
+        """
+        Drop the non-unique secondary indexes so bulk inserts skip index maintenance.
+        
+        Returns:
+            CREATE INDEX statements to restore the dropped indexes
+        """
+        # sql is NULL for the automatic indexes behind PRIMARY KEY and UNIQUE
+        self.cursor.execute('''
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL
+              AND sql NOT LIKE 'CREATE UNIQUE%'
+        ''')
+        indexes = self.cursor.fetchall()
+        
+        for name, _ in indexes:
+            self.cursor.execute(f'DROP INDEX "{name}"')
+        
+        if indexes:
+            logger.info(f"Dropped {len(indexes)} indexes for bulk loading")
+        return [sql for _, sql in indexes]
+    
+    @_in_transaction
     def populate_categories(self):
         """
         Populate the categories table with a realistic category hierarchy.
@@ -103,15 +377,12 @@ class DatabaseSeeder:
             ('Office Supplies', 'Office and school supplies', None),
         ]
         
-        # Insert main categories
-        for category_name, description, parent_id in categories_data:
-            self.cursor.execute('''
-                INSERT INTO categories (category_name, description, parent_category_id)
-                VALUES (?, ?, ?)
-            ''', (category_name, description, parent_id))
-        
-        # Get the inserted category IDs
-        self.cursor.execute("SELECT category_id, category_name FROM categories WHERE parent_category_id IS NULL")
+        # Insert main categories in one statement and read their IDs back
+        self.cursor.execute(f'''
+            INSERT INTO categories (category_name, description, parent_category_id)
+            VALUES {", ".join(["(?, ?, ?)"] * len(categories_data))}
+            RETURNING category_name, category_id
+        ''', [value for row in categories_data for value in row])
         main_categories = dict(self.cursor.fetchall())
         
         # Add subcategories
@@ -143,21 +414,25 @@ class DatabaseSeeder:
             ('Garden Tools', 'Gardening equipment', 'Home & Garden'),
         ]
         
-        # Insert subcategories
-        for subcat_name, description, parent_name in subcategories_data:
-            parent_id = next((k for k, v in main_categories.items() if v == parent_name), None)
-            if parent_id:
-                self.cursor.execute('''
-                    INSERT INTO categories (category_name, description, parent_category_id)
-                    VALUES (?, ?, ?)
-                ''', (subcat_name, description, parent_id))
+        # Insert subcategories under their parents' IDs
+        subcategory_rows = [
+            (subcat_name, description, main_categories[parent_name])
+            for subcat_name, description, parent_name in subcategories_data
+            if parent_name in main_categories
+        ]
+        self.cursor.execute(f'''
+            INSERT INTO categories (category_name, description, parent_category_id)
+            VALUES {", ".join(["(?, ?, ?)"] * len(subcategory_rows))}
+            RETURNING category_id
+        ''', [value for row in subcategory_rows for value in row])
         
         # Store all category IDs for later use
-        self.cursor.execute("SELECT category_id FROM categories")
-        self.category_ids = [row[0] for row in self.cursor.fetchall()]
+        self.category_ids = list(main_categories.values())
+        self.category_ids.extend(row[0] for row in self.cursor.fetchall())
         
         logger.info(f"Created {len(self.category_ids)} categories")
     
+    @_in_transaction
     def populate_customers(self, num_customers: int = 100):
         """
         Populate the customers table with realistic customer data.
@@ -209,67 +484,79 @@ class DatabaseSeeder:
         customer_types = ['regular', 'regular', 'regular', 'premium', 'vip']  # Weighted towards regular
         payment_methods = ['credit_card', 'debit_card', 'paypal', 'apple_pay', 'google_pay']
         
+        # Draw every column up front so the row loop only indexes into lists
+        first_picks = random.choices(first_names, k=num_customers)
+        last_picks = random.choices(last_names, k=num_customers)
+        email_numbers = _randints(1, 999, num_customers)
+        phone_prefixes = _randints(100, 999, num_customers)
+        phone_lines = _randints(1000, 9999, num_customers)
+        city_picks = random.choices(cities, k=num_customers)
+        house_numbers = _randints(1, 9999, num_customers)
+        street_names = random.choices(['Main', 'Oak', 'Elm', 'Maple', 'Cedar'], k=num_customers)
+        street_types = random.choices(['St', 'Ave', 'Rd', 'Blvd', 'Ln'], k=num_customers)
+        ages = _randints(18, 80, num_customers)  # 18-80 years old
+        birth_offsets = _randints(0, 364, num_customers)
+        genders = random.choices(['M', 'F', 'Other', None], k=num_customers)
+        type_picks = random.choices(customer_types, k=num_customers)
+        created_days_ago = _randints(0, 1095, num_customers)  # Within last 3 years
+        login_days_ago = _randints(0, 30, num_customers)
+        payment_picks = random.choices(payment_methods, k=num_customers)
+        logged_in = _bernoulli(0.7, num_customers)  # 70% are active
+        email_verified = _bernoulli(0.9, num_customers)
+        is_active = _bernoulli(0.95, num_customers)
+        
+        # VIP customers get more loyalty points
+        loyalty_ranges = {'vip': (1000, 5000), 'premium': (100, 1000), 'regular': (0, 100)}
+        
+        today = date.today()
+        day_stamps = _day_stamps(datetime.now(), 0, 1095)
+        
+        # Assemble the formatted columns in one pass each
+        emails = [
+            f"{first_name.lower()}.{last_name.lower()}{number}@example.com"
+            for first_name, last_name, number in zip(first_picks, last_picks, email_numbers)
+        ]
+        phones = [f"555-{prefix}-{line}" for prefix, line in zip(phone_prefixes, phone_lines)]
+        addresses = [
+            f"{number} {street} {street_type}"
+            for number, street, street_type in zip(house_numbers, street_names, street_types)
+        ]
+        
+        # Simple password hashes (in production, use proper hashing like bcrypt).
+        # Hashes of "password{i}" share a prefix, so only the suffix is fed per row
+        password_prefix = hashlib.sha256(b"password")
+        password_hashes = []
         for i in range(num_customers):
-            first_name = random.choice(first_names)
-            last_name = random.choice(last_names)
-            email = f"{first_name.lower()}.{last_name.lower()}{random.randint(1, 999)}@example.com"
-            phone = f"555-{random.randint(100, 999)}-{random.randint(1000, 9999)}"
-            
-            # Simple password hash (in production, use proper hashing like bcrypt)
-            password_hash = hashlib.sha256(f"password{i}".encode()).hexdigest()
-            
-            city, state, zip_code = random.choice(cities)
-            address = f"{random.randint(1, 9999)} {random.choice(['Main', 'Oak', 'Elm', 'Maple', 'Cedar'])} {random.choice(['St', 'Ave', 'Rd', 'Blvd', 'Ln'])}"
-            
-            # Random date of birth (18-80 years old)
-            today = date.today()
-            age = random.randint(18, 80)
-            dob = today - timedelta(days=age*365 + random.randint(0, 364))
-            
-            gender = random.choice(['M', 'F', 'Other', None])
-            customer_type = random.choice(customer_types)
-            
-            # VIP customers get more loyalty points
-            if customer_type == 'vip':
-                loyalty_points = random.randint(1000, 5000)
-            elif customer_type == 'premium':
-                loyalty_points = random.randint(100, 1000)
-            else:
-                loyalty_points = random.randint(0, 100)
-            
-            # Customer creation date (within last 3 years)
-            created_days_ago = random.randint(0, 1095)
-            created_at = datetime.now() - timedelta(days=created_days_ago)
-            
-            # Last login (recent for active customers)
-            if random.random() > 0.3:  # 70% are active
-                last_login = datetime.now() - timedelta(days=random.randint(0, 30))
-            else:
-                last_login = None
-            
-            self.cursor.execute('''
-                INSERT INTO customers (
-                    first_name, last_name, email, phone, password_hash,
-                    address, city, state, zip_code, country,
-                    date_of_birth, gender, loyalty_points, customer_type,
-                    preferred_payment_method, created_at, last_login_at,
-                    email_verified, is_active
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                first_name, last_name, email, phone, password_hash,
-                address, city, state, zip_code, 'USA',
-                dob, gender, loyalty_points, customer_type,
-                random.choice(payment_methods), created_at, last_login,
-                random.random() > 0.1,  # 90% have verified email
-                random.random() > 0.05  # 95% are active
-            ))
+            password_hasher = password_prefix.copy()
+            password_hasher.update(str(i).encode())
+            password_hashes.append(password_hasher.hexdigest())
+        
+        city_names, states, zip_codes = zip(*city_picks)
+        dobs = [today - timedelta(days=age*365 + offset) for age, offset in zip(ages, birth_offsets)]
+        loyalty_points = [random.randint(*loyalty_ranges[customer_type]) for customer_type in type_picks]
+        created_ats = [day_stamps[days] for days in created_days_ago]
+        
+        # Last login (recent for active customers)
+        last_logins = [
+            day_stamps[days] if active else None
+            for days, active in zip(login_days_ago, logged_in)
+        ]
+        
+        first_id = self._next_id('customers', 'customer_id')
+        self.conn.executemany(_INSERT_CUSTOMER, zip(
+            first_picks, last_picks, emails, phones, password_hashes,
+            addresses, city_names, states, zip_codes, repeat('USA'),
+            dobs, genders, loyalty_points, type_picks,
+            payment_picks, created_ats, last_logins,
+            email_verified, is_active
+        ))
         
         # Store customer IDs for later use
-        self.cursor.execute("SELECT customer_id FROM customers")
-        self.customer_ids = [row[0] for row in self.cursor.fetchall()]
+        self.customer_ids = list(range(first_id, first_id + num_customers))
         
         logger.info(f"Created {len(self.customer_ids)} customers")
     
+    @_in_transaction
     def populate_products(self, num_products: int = 200):
         """
         Populate the products table with realistic product data.
@@ -354,17 +641,45 @@ class DatabaseSeeder:
                 WHERE c2.parent_category_id = c1.category_id
             )
         ''')
-        leaf_categories = dict(self.cursor.fetchall())
+        leaf_categories = [
+            (category_id, category_name, product_templates.get(category_name))
+            for category_id, category_name in self.cursor.fetchall()
+        ]
         
-        for _ in range(num_products):
-            # Select a random category
-            category_id = random.choice(list(leaf_categories.keys()))
-            category_name = leaf_categories[category_id]
-            
-            # Get product template for this category
-            if category_name in product_templates:
-                template = random.choice(product_templates[category_name])
-                base_name, brand, base_price, description = template
+        # Draw categories and the independent numeric columns up front
+        category_picks = random.choices(leaf_categories, k=num_products)
+        cost_factors = [random.uniform(0.6, 0.8) for _ in range(num_products)]  # 60-80% of price
+        stock_quantities = _randints(0, 500, num_products)
+        reserved_draws = _randints(0, 20, num_products)
+        reorder_levels = _randints(10, 50, num_products)
+        discount_picks = random.choices([0, 0, 0, 5, 10, 15, 20, 25], k=num_products)  # Most have no discount
+        tax_picks = random.choices([0, 6.5, 7.0, 8.5, 9.0], k=num_products)  # Various tax rates
+        material_picks = random.choices(materials, k=num_products)
+        view_counts = _randints(0, 10000, num_products)
+        launch_days_ago = _randints(0, 730, num_products)  # Within last 2 years
+        has_weight = _bernoulli(0.7, num_products)
+        has_dimensions = _bernoulli(0.5, num_products)
+        is_featured = _bernoulli(0.1, num_products)
+        is_active = _bernoulli(0.95, num_products)
+        has_rating = _bernoulli(0.7, num_products)
+        
+        launch_stamps = _day_stamps(date.today(), 0, 730)
+        
+        # Columns that depend on the category's templates
+        product_names = []
+        category_ids = []
+        skus = []
+        prices = []
+        descriptions = []
+        brands = []
+        product_colors = []
+        product_sizes = []
+        for i in range(num_products):
+            category_id, category_name, templates = category_picks[i]
+            
+            # Use a product template when this category has them
+            if templates:
+                base_name, brand, base_price, description = random.choice(templates)
                 
                 # Add variations
                 color = random.choice(colors) if random.random() > 0.3 else None
@@ -389,69 +704,54 @@ class DatabaseSeeder:
                 color = random.choice(colors) if random.random() > 0.5 else None
                 size = None
             
-            # Generate SKU
-            sku = f"SKU-{category_id:03d}-{products_created:05d}"
-            
-            # Cost (60-80% of price for margin calculation)
-            cost = price * random.uniform(0.6, 0.8)
-            
-            # Stock levels
-            stock_quantity = random.randint(0, 500)
-            reserved_quantity = min(random.randint(0, 20), stock_quantity)
-            reorder_level = random.randint(10, 50)
-            
-            # Product attributes
-            weight = random.uniform(0.1, 10.0) if random.random() > 0.3 else None
-            dimensions = f"{random.randint(5,50)}x{random.randint(5,50)}x{random.randint(5,50)}" if random.random() > 0.5 else None
-            
-            # Features and status
-            is_featured = random.random() > 0.9  # 10% are featured
-            is_active = random.random() > 0.05  # 95% are active
-            discount_percentage = random.choice([0, 0, 0, 5, 10, 15, 20, 25])  # Most have no discount
-            tax_rate = random.choice([0, 6.5, 7.0, 8.5, 9.0])  # Various tax rates
-            
-            # Ratings (products with more history have ratings)
-            if random.random() > 0.3:  # 70% have ratings
-                rating_count = random.randint(1, 500)
-                rating_average = random.uniform(3.0, 5.0)
-            else:
-                rating_count = 0
-                rating_average = 0
-            
-            # View count (popular products have more views)
-            view_count = random.randint(0, 10000)
-            
-            # Launch date (within last 2 years)
-            launch_date = date.today() - timedelta(days=random.randint(0, 730))
-            
-            self.cursor.execute('''
-                INSERT INTO products (
-                    product_name, category_id, sku, price, cost,
-                    stock_quantity, reserved_quantity, reorder_level,
-                    description, brand, weight, dimensions,
-                    color, size, material,
-                    is_active, is_featured, discount_percentage, tax_rate,
-                    rating_average, rating_count, view_count,
-                    launch_date
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                product_name, category_id, sku, round(price, 2), round(cost, 2),
-                stock_quantity, reserved_quantity, reorder_level,
-                description, brand, weight, dimensions,
-                color, size, random.choice(materials),
-                is_active, is_featured, discount_percentage, tax_rate,
-                round(rating_average, 2), rating_count, view_count,
-                launch_date
-            ))
+            product_names.append(product_name)
+            category_ids.append(category_id)
+            skus.append("SKU-%03d-%05d" % (category_id, products_created))
+            prices.append(price)
+            descriptions.append(description)
+            brands.append(brand)
+            product_colors.append(color)
+            product_sizes.append(size)
             
             products_created += 1
         
+        # Cost for margin calculation, in cents like the price
+        costs = [round(price * factor * 100) for price, factor in zip(prices, cost_factors)]
+        price_cents = [round(price * 100) for price in prices]
+        
+        # Stock levels
+        reserved_quantities = [min(reserved, stock) for reserved, stock in zip(reserved_draws, stock_quantities)]
+        
+        # Product attributes
+        weights = [random.uniform(0.1, 10.0) if flag else None for flag in has_weight]
+        dimensions = [
+            f"{random.randint(5,50)}x{random.randint(5,50)}x{random.randint(5,50)}" if flag else None
+            for flag in has_dimensions
+        ]
+        
+        # Ratings (products with more history have ratings)
+        rating_counts = [random.randint(1, 500) if flag else 0 for flag in has_rating]
+        rating_averages = [round(random.uniform(3.0, 5.0), 2) if flag else 0 for flag in has_rating]
+        
+        launch_dates = [launch_stamps[days] for days in launch_days_ago]
+        
+        first_id = self._next_id('products', 'product_id')
+        self.conn.executemany(_INSERT_PRODUCT, zip(
+            product_names, category_ids, skus, price_cents, costs,
+            stock_quantities, reserved_quantities, reorder_levels,
+            descriptions, brands, weights, dimensions,
+            product_colors, product_sizes, material_picks,
+            is_active, is_featured, discount_picks, tax_picks,
+            rating_averages, rating_counts, view_counts,
+            launch_dates
+        ))
+        
         # Store product IDs for later use
-        self.cursor.execute("SELECT product_id FROM products")
-        self.product_ids = [row[0] for row in self.cursor.fetchall()]
+        self.product_ids = list(range(first_id, first_id + num_products))
         
         logger.info(f"Created {len(self.product_ids)} products")
     
+    @_in_transaction
     def populate_orders(self, num_orders: int = 500):
         """
         Populate orders and order_items tables with realistic order data.
@@ -466,23 +766,37 @@ class DatabaseSeeder:
         payment_methods = ['credit_card', 'debit_card', 'paypal', 'apple_pay', 'google_pay', 'bank_transfer']
         shipping_methods = ['standard', 'express', 'overnight']
         
+        # Load shipping details and pricing once instead of querying per row
+        self.cursor.execute('''
+            SELECT customer_id, address, city, state, zip_code, country, preferred_payment_method
+            FROM customers
+        ''')
+        self._customers = {row[0]: row[1:] for row in self.cursor.fetchall()}
+        
+        self.cursor.execute("SELECT product_id, price, discount_percentage, tax_rate FROM products")
+        self._products_info = {
+            row[0]: (row[1], row[2] or 0, row[3] or 0) for row in self.cursor.fetchall()
+        }
+        
+        # Order dates run from 180 days ago to required dates up to 10 days ahead
+        day_stamps = _day_stamps(datetime.now(), -10, 180)
+        
+        # Order IDs are assigned here so items can reference them before insert
+        next_order_id = self._next_id('orders', 'order_id')
+        
+        order_rows = []
+        item_rows = []
         for order_num in range(num_orders):
             # Select a random customer
             customer_id = random.choice(self.customer_ids)
-            
-            # Get customer info for shipping address
-            self.cursor.execute('''
-                SELECT address, city, state, zip_code, country, preferred_payment_method
-                FROM customers WHERE customer_id = ?
-            ''', (customer_id,))
-            customer_info = self.cursor.fetchone()
+            customer_info = self._customers[customer_id]
             
             # Order date (within last 6 months)
             days_ago = random.randint(0, 180)
-            order_date = datetime.now() - timedelta(days=days_ago)
+            order_date = day_stamps[days_ago]
             
             # Order number (human-readable)
-            order_number = f"ORD-{order_date.strftime('%Y%m')}-{order_num:05d}"
+            order_number = f"ORD-{order_date[:4]}{order_date[5:7]}-{order_num:05d}"
             
             # Status based on age of order
             if days_ago < 7:
@@ -501,53 +815,33 @@ class DatabaseSeeder:
                 payment_status = random.choice(['pending', 'paid'])
             
             # Dates based on status
-            required_date = order_date + timedelta(days=random.randint(3, 10))
+            required_date = day_stamps[days_ago - random.randint(3, 10)]
             shipped_date = None
             delivered_date = None
             
             if status in ['shipped', 'delivered']:
-                shipped_date = order_date + timedelta(days=random.randint(1, 3))
-            
-            if status == 'delivered':
-                delivered_date = shipped_date + timedelta(days=random.randint(1, 5))
+                shipped_days_ago = days_ago - random.randint(1, 3)
+                shipped_date = day_stamps[shipped_days_ago]
+                
+                if status == 'delivered':
+                    delivered_date = day_stamps[shipped_days_ago - random.randint(1, 5)]
             
             # Payment and shipping
             payment_method = customer_info[5] or random.choice(payment_methods)
             shipping_method = random.choice(shipping_methods)
             
-            # Shipping cost based on method
-            shipping_costs = {'standard': 5.99, 'express': 12.99, 'overnight': 29.99}
+            # Shipping cost based on method (in cents)
+            shipping_costs = {'standard': 599, 'express': 1299, 'overnight': 2999}
             shipping_cost = shipping_costs[shipping_method]
             
             # Tracking number for shipped orders
             tracking_number = f"TRK{random.randint(100000000, 999999999)}" if shipped_date else None
             
-            # Insert order (totals will be updated after adding items)
-            self.cursor.execute('''
-                INSERT INTO orders (
-                    customer_id, order_number, order_date, required_date,
-                    shipped_date, delivered_date, status, payment_status,
-                    payment_method, shipping_method, shipping_cost,
-                    shipping_address, shipping_city, shipping_state,
-                    shipping_zip, shipping_country,
-                    billing_address, billing_city, billing_state,
-                    billing_zip, billing_country,
-                    tracking_number, subtotal, tax_amount, 
-                    discount_amount, total_amount
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0, 0)
-            ''', (
-                customer_id, order_number, order_date, required_date,
-                shipped_date, delivered_date, status, payment_status,
-                payment_method, shipping_method, shipping_cost,
-                customer_info[0], customer_info[1], customer_info[2],
-                customer_info[3], customer_info[4],
-                customer_info[0], customer_info[1], customer_info[2],
-                customer_info[3], customer_info[4],
-                tracking_number
-            ))
-            
-            order_id = self.cursor.lastrowid
+            order_id = next_order_id + order_num
             self.order_ids.append(order_id)
+            fulfillment_status_id = self._status_id(
+                'fulfillment_status', 'delivered' if status == 'delivered' else 'pending'
+            )
             
             # Add order items (1-10 items per order)
             num_items = random.randint(1, 10)
@@ -557,63 +851,57 @@ class DatabaseSeeder:
             tax_amount = 0
             discount_amount = 0
             
-            for product_id in selected_products:
-                # Get product info
-                self.cursor.execute('''
-                    SELECT price, discount_percentage, tax_rate
-                    FROM products WHERE product_id = ?
-                ''', (product_id,))
-                product_info = self.cursor.fetchone()
-                
+            # Quantities (usually 1-3), drawn for the whole order at once
+            quantities = random.choices([1, 2, 3, 4, 5], cum_weights=[50, 75, 90, 97, 100],
+                                        k=len(selected_products))
+            
+            for product_id, quantity in zip(selected_products, quantities):
+                product_info = self._products_info.get(product_id)
                 if not product_info:
                     continue
                 
-                unit_price = product_info[0]
-                discount_pct = product_info[1] or 0
-                tax_rate = product_info[2] or 0
+                unit_price, discount_pct, tax_rate = product_info
                 
-                # Quantity (usually 1-3)
-                quantity = random.choices([1, 2, 3, 4, 5], weights=[50, 25, 15, 7, 3])[0]
-                
-                # Calculate amounts
-                item_discount = (unit_price * quantity * discount_pct / 100)
+                # Calculate amounts in whole cents
+                item_discount = round(unit_price * quantity * discount_pct / 100)
                 item_subtotal = (unit_price * quantity) - item_discount
-                item_tax = item_subtotal * (tax_rate / 100)
+                item_tax = round(item_subtotal * tax_rate / 100)
                 item_total = item_subtotal + item_tax
                 
-                # Insert order item
-                self.cursor.execute('''
-                    INSERT INTO order_items (
-                        order_id, product_id, quantity, unit_price,
-                        discount_amount, tax_amount, subtotal, total,
-                        fulfillment_status
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                item_rows.append((
                     order_id, product_id, quantity, unit_price,
-                    round(item_discount, 2), round(item_tax, 2),
-                    round(item_subtotal, 2), round(item_total, 2),
-                    'delivered' if status == 'delivered' else 'pending'
+                    item_discount, item_tax, item_subtotal, item_total,
+                    fulfillment_status_id
                 ))
                 
                 subtotal += item_subtotal
                 tax_amount += item_tax
                 discount_amount += item_discount
             
-            # Update order totals
+            # Order totals are known once its items are priced
             total_amount = subtotal + tax_amount + shipping_cost
             
-            self.cursor.execute('''
-                UPDATE orders 
-                SET subtotal = ?, tax_amount = ?, discount_amount = ?, total_amount = ?
-                WHERE order_id = ?
-            ''', (
-                round(subtotal, 2), round(tax_amount, 2),
-                round(discount_amount, 2), round(total_amount, 2),
-                order_id
+            order_rows.append((
+                order_id, customer_id, order_number, order_date, required_date,
+                shipped_date, delivered_date,
+                self._status_id('order_status', status),
+                self._status_id('payment_status', payment_status),
+                payment_method, shipping_method, shipping_cost,
+                customer_info[0], customer_info[1], customer_info[2],
+                customer_info[3], customer_info[4],
+                customer_info[0], customer_info[1], customer_info[2],
+                customer_info[3], customer_info[4],
+                tracking_number, subtotal, tax_amount,
+                discount_amount, total_amount
             ))
         
+        self.conn.executemany(_INSERT_ORDER, order_rows)
+        
+        self.conn.executemany(_INSERT_ORDER_ITEM, item_rows)
+        
         logger.info(f"Created {len(self.order_ids)} orders with items")
     
+    @_in_transaction
     def populate_product_reviews(self):
         """
         Populate the product_reviews table with realistic review data.
@@ -650,34 +938,33 @@ class DatabaseSeeder:
             'Received a defective item. Poor quality control.'
         ]
         
-        # Get all delivered orders with their products
+        # Get all delivered orders with their products and delivery dates
         self.cursor.execute('''
-            SELECT DISTINCT oi.order_id, oi.product_id, o.customer_id
+            SELECT DISTINCT oi.order_id, oi.product_id, o.customer_id, o.delivered_date
             FROM order_items oi
             JOIN orders o ON oi.order_id = o.order_id
-            WHERE o.status = 'delivered'
+            JOIN order_status s ON o.status_id = s.status_id
+            WHERE s.name = 'delivered'
             LIMIT 200
         ''')
         
         delivered_items = self.cursor.fetchall()
         
-        reviews_created = 0
-        for order_id, product_id, customer_id in delivered_items:
-            # Not everyone leaves reviews (30% chance)
-            if random.random() > 0.3:
-                continue
-            
-            # Check if review already exists
-            self.cursor.execute('''
-                SELECT COUNT(*) FROM product_reviews 
-                WHERE product_id = ? AND customer_id = ? AND order_id = ?
-            ''', (product_id, customer_id, order_id))
-            
-            if self.cursor.fetchone()[0] > 0:
-                continue
-            
-            # Generate rating (weighted towards positive)
-            rating = random.choices([1, 2, 3, 4, 5], weights=[5, 10, 15, 30, 40])[0]
+        # Not everyone leaves reviews: pick the 30% who do up front
+        delivered_items = random.sample(delivered_items, int(len(delivered_items) * 0.3))
+        
+        approved_id = self._status_id('review_status', 'approved')
+        
+        # Ratings (weighted towards positive) and review statuses (most are
+        # approved), drawn for every reviewer up front
+        ratings = random.choices([1, 2, 3, 4, 5], cum_weights=[5, 15, 30, 60, 100], k=len(delivered_items))
+        statuses = random.choices(['approved', 'pending', 'rejected'], cum_weights=[85, 95, 100],
+                                  k=len(delivered_items))
+        
+        now = datetime.now()
+        review_rows = []
+        for i, (order_id, product_id, customer_id, delivered_date) in enumerate(delivered_items):
+            rating = ratings[i]
             
             # Select appropriate comments based on rating
             if rating >= 4:
@@ -697,129 +984,135 @@ class DatabaseSeeder:
             helpful_count = random.randint(0, 50) if random.random() > 0.5 else 0
             not_helpful_count = random.randint(0, 10) if helpful_count > 0 else 0
             
-            # Review status (most are approved)
-            status = random.choices(['approved', 'pending', 'rejected'], weights=[85, 10, 5])[0]
+            status = statuses[i]
             
             # Created date (after order delivery)
-            self.cursor.execute('SELECT delivered_date FROM orders WHERE order_id = ?', (order_id,))
-            delivered_date = self.cursor.fetchone()[0]
             if delivered_date:
                 review_date = datetime.fromisoformat(delivered_date) + timedelta(days=random.randint(1, 30))
             else:
-                review_date = datetime.now() - timedelta(days=random.randint(1, 90))
-            
-            self.cursor.execute('''
-                INSERT INTO product_reviews (
-                    product_id, customer_id, order_id, rating,
-                    title, comment, is_verified_purchase, is_recommended,
-                    helpful_count, not_helpful_count, status, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+                review_date = now - timedelta(days=random.randint(1, 90))
+            
+            review_rows.append((
                 product_id, customer_id, order_id, rating,
                 title, comment, True, is_recommended,
-                helpful_count, not_helpful_count, status, review_date
+                helpful_count, not_helpful_count,
+                self._status_id('review_status', status), review_date
             ))
-            
-            reviews_created += 1
-            
-            # Update product rating average
-            self.cursor.execute('''
-                UPDATE products 
-                SET rating_average = (
-                    SELECT AVG(rating) FROM product_reviews 
-                    WHERE product_id = ? AND status = 'approved'
-                ),
-                rating_count = (
-                    SELECT COUNT(*) FROM product_reviews 
-                    WHERE product_id = ? AND status = 'approved'
-                )
-                WHERE product_id = ?
-            ''', (product_id, product_id, product_id))
+        
+        reviews_created = self.conn.executemany(_INSERT_REVIEW, review_rows).rowcount
+        
+        # Recompute ratings for every reviewed product from one grouped pass
+        # over the reviews; products with no approved reviews drop to 0
+        self.cursor.execute('''
+            UPDATE products
+            SET rating_average = agg.rating_average,
+                rating_count = agg.rating_count
+            FROM (
+                SELECT product_id,
+                       COALESCE(AVG(CASE WHEN status_id = :approved THEN rating END), 0) AS rating_average,
+                       COUNT(CASE WHEN status_id = :approved THEN 1 END) AS rating_count
+                FROM product_reviews
+                GROUP BY product_id
+            ) AS agg
+            WHERE agg.product_id = products.product_id
+        ''', {'approved': approved_id})
         
         logger.info(f"Created {reviews_created} product reviews")
     
+    @_in_transaction
     def populate_carts(self):
         """
         Populate cart and cart_items tables with active and abandoned carts.
         """
         logger.info("Populating shopping carts...")
         
-        carts_created = 0
+        # Cart IDs are assigned here so items can reference them before insert
+        next_cart_id = self._next_id('cart', 'cart_id')
+        
+        # Cart items are consecutive runs from one shuffled ring of the
+        # product IDs, so each cart's items stay distinct without a
+        # random.sample call per cart
+        shuffled_products = random.sample(self.product_ids, len(self.product_ids))
+        product_ring = shuffled_products + shuffled_products
+        num_products = len(shuffled_products)
+        
+        now = datetime.now()
+        cart_rows = []
+        item_rows = []
+        reserved = {}
         
         # Create carts for 30% of customers
         sample_customers = random.sample(self.customer_ids, int(len(self.customer_ids) * 0.3))
         
-        for customer_id in sample_customers:
-            # Cart status (most are active)
-            status = random.choices(['active', 'abandoned', 'converted'], weights=[60, 30, 10])[0]
-            
+        # Cart statuses (most are active)
+        statuses = random.choices(['active', 'abandoned', 'converted'], cum_weights=[60, 90, 100],
+                                  k=len(sample_customers))
+        
+        for customer_id, status in zip(sample_customers, statuses):            
             # Cart age
             if status == 'active':
-                created_at = datetime.now() - timedelta(hours=random.randint(1, 72))
+                created_at = now - timedelta(hours=random.randint(1, 72))
             elif status == 'abandoned':
-                created_at = datetime.now() - timedelta(days=random.randint(3, 30))
+                created_at = now - timedelta(days=random.randint(3, 30))
             else:  # converted
-                created_at = datetime.now() - timedelta(days=random.randint(1, 60))
+                created_at = now - timedelta(days=random.randint(1, 60))
             
             expires_at = created_at + timedelta(days=30)
             
-            self.cursor.execute('''
-                INSERT INTO cart (customer_id, status, created_at, updated_at, expires_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (customer_id, status, created_at, created_at, expires_at))
-            
-            cart_id = self.cursor.lastrowid
+            cart_id = next_cart_id + len(cart_rows)
+            cart_rows.append((
+                cart_id, customer_id, None, self._status_id('cart_status', status),
+                created_at, created_at, expires_at
+            ))
             
             # Add items to cart (1-5 items)
             num_items = random.randint(1, 5)
-            selected_products = random.sample(self.product_ids, min(num_items, len(self.product_ids)))
+            start = random.randrange(num_products or 1)
+            selected_products = product_ring[start:start + min(num_items, num_products)]
             
-            for product_id in selected_products:
-                quantity = random.choices([1, 2, 3], weights=[70, 20, 10])[0]
+            quantities = random.choices([1, 2, 3], cum_weights=[70, 90, 100], k=len(selected_products))
+            
+            for product_id, quantity in zip(selected_products, quantities):
                 saved_for_later = random.random() > 0.9  # 10% saved for later
                 
-                self.cursor.execute('''
-                    INSERT INTO cart_items (cart_id, product_id, quantity, saved_for_later, added_at)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (cart_id, product_id, quantity, saved_for_later, created_at))
+                item_rows.append((cart_id, product_id, quantity, saved_for_later, created_at))
                 
-                # Update product reserved quantity for active carts
+                # Reserve stock for items in active carts
                 if status == 'active' and not saved_for_later:
-                    self.cursor.execute('''
-                        UPDATE products 
-                        SET reserved_quantity = reserved_quantity + ?
-                        WHERE product_id = ?
-                    ''', (quantity, product_id))
-            
-            carts_created += 1
+                    reserved[product_id] = reserved.get(product_id, 0) + quantity
         
         # Create some anonymous carts (with session_id only)
         for _ in range(20):
             session_id = f"session_{random.randint(100000, 999999)}"
-            created_at = datetime.now() - timedelta(hours=random.randint(1, 168))
+            created_at = now - timedelta(hours=random.randint(1, 168))
             expires_at = created_at + timedelta(days=7)  # Anonymous carts expire faster
             
-            self.cursor.execute('''
-                INSERT INTO cart (session_id, status, created_at, updated_at, expires_at)
-                VALUES (?, 'abandoned', ?, ?, ?)
-            ''', (session_id, created_at, created_at, expires_at))
-            
-            cart_id = self.cursor.lastrowid
+            cart_id = next_cart_id + len(cart_rows)
+            cart_rows.append((
+                cart_id, None, session_id, self._status_id('cart_status', 'abandoned'),
+                created_at, created_at, expires_at
+            ))
             
             # Add 1-3 items
             num_items = random.randint(1, 3)
-            selected_products = random.sample(self.product_ids, min(num_items, len(self.product_ids)))
+            start = random.randrange(num_products or 1)
+            selected_products = product_ring[start:start + min(num_items, num_products)]
             
             for product_id in selected_products:
-                self.cursor.execute('''
-                    INSERT INTO cart_items (cart_id, product_id, quantity, added_at)
-                    VALUES (?, ?, 1, ?)
-                ''', (cart_id, product_id, created_at))
-            
-            carts_created += 1
+                item_rows.append((cart_id, product_id, 1, False, created_at))
+        
+        self.conn.executemany(_INSERT_CART, cart_rows)
+        
+        self.conn.executemany(_INSERT_CART_ITEM, item_rows)
+        
+        # Update product reserved quantities for active carts
+        self.conn.executemany(
+            _RESERVE_STOCK, [(quantity, product_id) for product_id, quantity in reserved.items()]
+        )
         
-        logger.info(f"Created {carts_created} shopping carts")
+        logger.info(f"Created {len(cart_rows)} shopping carts")
     
+    @_in_transaction
     def populate_inventory_logs(self):
         """
         Populate inventory_log table with historical inventory movements.
@@ -828,19 +1121,23 @@ class DatabaseSeeder:
         
         change_types = ['purchase', 'sale', 'return', 'adjustment', 'damage', 'restock']
         
-        logs_created = 0
+        # Current stock of every product, read once
+        self.cursor.execute("SELECT product_id, stock_quantity FROM products")
+        stock = dict(self.cursor.fetchall())
+        
+        # Log entries fall 1-180 days back
+        log_stamps = _day_stamps(datetime.now(), 1, 180)
+        
+        log_rows = []
         
         # Create logs for random products
         sample_products = random.sample(self.product_ids, min(50, len(self.product_ids)))
         
         for product_id in sample_products:
-            # Get current stock
-            self.cursor.execute('SELECT stock_quantity FROM products WHERE product_id = ?', (product_id,))
-            current_stock = self.cursor.fetchone()[0]
-            
             # Generate 3-10 historical events
             num_events = random.randint(3, 10)
-            running_stock = current_stock
+            log_days = _randints(1, 180, num_events)
+            running_stock = stock[product_id]
             
             for i in range(num_events):
                 change_type = random.choice(change_types)
@@ -869,15 +1166,9 @@ class DatabaseSeeder:
                     quantity_change = quantity_after - quantity_before
                 
                 # Create log entry
-                log_date = datetime.now() - timedelta(days=random.randint(1, 180))
+                log_date = log_stamps[log_days[i]]
                 
-                self.cursor.execute('''
-                    INSERT INTO inventory_log (
-                        product_id, change_type, quantity_change,
-                        quantity_before, quantity_after, notes,
-                        performed_by, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                log_rows.append((
                     product_id, change_type, quantity_change,
                     quantity_before, quantity_after,
                     f"{change_type.capitalize()} inventory adjustment",
@@ -885,9 +1176,10 @@ class DatabaseSeeder:
                 ))
                 
                 running_stock = quantity_before
-                logs_created += 1
         
-        logger.info(f"Created {logs_created} inventory log entries")
+        self.conn.executemany(_INSERT_INVENTORY_LOG, log_rows)
+        
+        logger.info(f"Created {len(log_rows)} inventory log entries")
     
     def _display_summary(self):
         """
@@ -903,9 +1195,23 @@ class DatabaseSeeder:
             'inventory_log'
         ]
         
-        for table in tables:
-            self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = self.cursor.fetchone()[0]
+        # Every figure below comes from this one query; only the top
+        # category needs its own GROUP BY
+        counts = ",\n                   ".join(f"(SELECT COUNT(*) FROM {table})" for table in tables)
+        self.cursor.execute(f"""
+            SELECT {counts},
+                   revenue.total, revenue.average,
+                   (SELECT COUNT(DISTINCT customer_id) FROM orders)
+            FROM (
+                SELECT SUM(o.total_amount) AS total, AVG(o.total_amount) AS average
+                FROM orders o
+                JOIN order_status s ON o.status_id = s.status_id
+                WHERE s.name NOT IN ('cancelled', 'refunded')
+            ) AS revenue
+        """)
+        *table_counts, revenue_total, revenue_average, customers_with_orders = self.cursor.fetchone()
+        
+        for table, count in zip(tables, table_counts):
             print(f"{table.capitalize():20} {count:,} records")
         
         # Additional statistics
@@ -914,19 +1220,11 @@ class DatabaseSeeder:
         print("-"*60)
         
         # Total revenue
-        self.cursor.execute("""
-            SELECT SUM(total_amount) FROM orders 
-            WHERE status NOT IN ('cancelled', 'refunded')
-        """)
-        total_revenue = self.cursor.fetchone()[0] or 0
+        total_revenue = (revenue_total or 0) / 100
         print(f"Total Revenue:       ${total_revenue:,.2f}")
         
         # Average order value
-        self.cursor.execute("""
-            SELECT AVG(total_amount) FROM orders 
-            WHERE status NOT IN ('cancelled', 'refunded')
-        """)
-        avg_order = self.cursor.fetchone()[0] or 0
+        avg_order = (revenue_average or 0) / 100
         print(f"Average Order Value: ${avg_order:,.2f}")
         
         # Top selling category
@@ -944,14 +1242,7 @@ class DatabaseSeeder:
             print(f"Top Category:        {top_category[0]} ({top_category[1]} items sold)")
         
         # Customer retention
-        self.cursor.execute("""
-            SELECT COUNT(DISTINCT customer_id) FROM orders
-        """)
-        customers_with_orders = self.cursor.fetchone()[0]
-        
-        self.cursor.execute("SELECT COUNT(*) FROM customers")
-        total_customers = self.cursor.fetchone()[0]
-        
+        total_customers = table_counts[tables.index('customers')]
         if total_customers > 0:
             retention_rate = (customers_with_orders / total_customers) * 100
             print(f"Customer Retention:  {retention_rate:.1f}%")
@@ -971,9 +1262,9 @@ def main():
     
     from database.creator import DatabaseCreator
     
-    # Create database first
+    # Build the database in memory, then write it out in one pass
     print("Creating database schema...")
-    with DatabaseCreator('data/ecommerce.db') as creator:
+    with DatabaseCreator(':memory:') as creator:
         conn = creator.create_database()
         
         # Populate with sample data
@@ -987,6 +1278,13 @@ def main():
             num_orders=500
         )
         
+        # Build indexes in one pass now that the data is loaded, then
+        # gather statistics before the summary tables are computed
+        creator.create_indexes()
+        creator.analyze()
+        creator.refresh_materialized_views()
+        creator.backup('data/ecommerce.db')
+        
         print("\n✅ Database successfully created and populated!")
         print("   Location: data/ecommerce.db")
 
@@ -3,8 +3,7 @@ Interactive interface module for the Text-to-SQL Agent.
 Provides terminal-based user interface with rich features.
 """
 
-from .terminal import InteractiveAgent
-from .commands import CommandHandler
+import logging
 
 __all__ = [
     'InteractiveAgent',
@@ -15,6 +14,22 @@ __all__ = [
 __version__ = '1.0.0'
 
 
+def __getattr__(name: str):
+    """
+    Import the interactive classes on first access.
+    
+    Keeps ``import src.interface`` from pulling in readline, colorama and
+    the agent stack for callers that only need the configuration helpers.
+    """
+    if name == 'InteractiveAgent':
+        from .terminal import InteractiveAgent
+        return InteractiveAgent
+    if name == 'CommandHandler':
+        from .commands import CommandHandler
+        return CommandHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def run_interactive_session(config: dict = None):
     """
     Run an interactive Text-to-SQL session.
@@ -41,6 +56,14 @@ def run_interactive_session(config: dict = None):
         ...     'model': 'gpt-4'
         ... })
     """
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+    
+    from .terminal import InteractiveAgent
+    
     try:
         # Create and run the interactive agent
         agent = InteractiveAgent(config)
@@ -106,6 +129,32 @@ DEFAULT_CONFIG = {
     'debug_mode': False
 }
 
+# Set once the .env file has been loaded into the environment
+_DOTENV_LOADED = False
+
+# Models accepted by InterfaceConfig and the `model` command
+_VALID_MODELS = frozenset({'gpt-4', 'gpt-3.5-turbo', 'gpt-4-turbo'})
+
+def _to_bool(value: str) -> bool:
+    """Parse a 'true'/'false' environment variable."""
+    return value.lower() == 'true'
+
+
+# Environment variables read by InterfaceConfig, mapped to a config key or
+# to a (config key, converter) pair
+_ENV_MAPPINGS = {
+    'OPENAI_API_KEY': 'api_key',
+    'DATABASE_PATH': 'db_path',
+    'MODEL_NAME': 'model',
+    'COLORS_ENABLED': ('colors_enabled', _to_bool),
+    'VERBOSE_MODE': ('verbose_mode', _to_bool),
+    'DEBUG_MODE': ('debug_mode', _to_bool),
+    'CACHE_ENABLED': ('cache_enabled', _to_bool),
+    'CACHE_TTL': ('cache_ttl', int),
+    'MAX_HISTORY': ('max_history', int),
+    'MAX_DISPLAY_ROWS': ('max_display_rows', int)
+}
+
 # Command shortcuts for quick access
 COMMAND_SHORTCUTS = {
     'h': 'help',
@@ -178,25 +227,16 @@ class InterfaceConfig:
     
     def _load_from_environment(self):
         """Load configuration from environment variables."""
+        global _DOTENV_LOADED
         import os
-        from dotenv import load_dotenv
         
-        load_dotenv()
+        # The .env file only needs to be read once per process
+        if not _DOTENV_LOADED:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _DOTENV_LOADED = True
         
-        env_mappings = {
-            'OPENAI_API_KEY': 'api_key',
-            'DATABASE_PATH': 'db_path',
-            'MODEL_NAME': 'model',
-            'COLORS_ENABLED': ('colors_enabled', lambda x: x.lower() == 'true'),
-            'VERBOSE_MODE': ('verbose_mode', lambda x: x.lower() == 'true'),
-            'DEBUG_MODE': ('debug_mode', lambda x: x.lower() == 'true'),
-            'CACHE_ENABLED': ('cache_enabled', lambda x: x.lower() == 'true'),
-            'CACHE_TTL': ('cache_ttl', int),
-            'MAX_HISTORY': ('max_history', int),
-            'MAX_DISPLAY_ROWS': ('max_display_rows', int)
-        }
-        
-        for env_key, mapping in env_mappings.items():
+        for env_key, mapping in _ENV_MAPPINGS.items():
             env_value = os.getenv(env_key)
             if env_value is not None:
                 if isinstance(mapping, tuple):
@@ -212,9 +252,8 @@ class InterfaceConfig:
             raise ValueError("Database path is required")
         
         # Validate model
-        valid_models = ['gpt-4', 'gpt-3.5-turbo', 'gpt-4-turbo']
-        if self.config['model'] not in valid_models:
-            raise ValueError(f"Invalid model. Must be one of: {valid_models}")
+        if self.config['model'] not in _VALID_MODELS:
+            raise ValueError(f"Invalid model. Must be one of: {sorted(_VALID_MODELS)}")
         
         # Validate numeric values
         if self.config['max_history'] < 1:
@@ -260,12 +299,6 @@ class InterfaceConfig:
         return self.config.copy()
 
 
-# Initialize module-level logger
-import logging
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
+# Initialize module-level logger; run_interactive_session configures
+# handlers when it starts
 logger = logging.getLogger(__name__)
\ No newline at end of file
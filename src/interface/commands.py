@@ -7,13 +7,57 @@ import os
 import sys
 import json
 import csv
+import time
+from itertools import islice
 from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime
 from colorama import Fore, Style
 import logging
 
+from . import _VALID_MODELS
+
 logger = logging.getLogger(__name__)
 
+# Config values `config` stores as booleans
+_BOOL_VALUES = {'true': True, 'false': False}
+
+# Number of analyzed queries remembered by `analyze`
+_ANALYSIS_CACHE_SIZE = 256
+
+# Command groups listed by `help`
+_HELP_CATEGORIES = (
+    ('Basic', ('help', 'exit', 'clear', 'history')),
+    ('Database', ('schema', 'tables', 'analyze')),
+    ('Results', ('export', 'cache', 'compare')),
+    ('Settings', ('config', 'verbose', 'colors', 'model')),
+    ('Advanced', ('optimize', 'validate', 'debug', 'benchmark')),
+    ('Other', ('stats', 'reset', 'examples', 'test'))
+)
+
+# Example queries shown by `examples`, by category
+_EXAMPLES = {
+    'basic': (
+        "Show all products",
+        "List customers from New York",
+        "Find orders from last week"
+    ),
+    'aggregation': (
+        "What is the total revenue?",
+        "How many orders per month?",
+        "Average order value by customer type"
+    ),
+    'analysis': (
+        "Top 10 best-selling products",
+        "Customers who spent more than $1000",
+        "Products with low stock"
+    ),
+    'complex': (
+        "Which products are frequently bought together?",
+        "Customer lifetime value analysis",
+        "Revenue trend over time"
+    )
+}
+
 
 class CommandHandler:
     """
@@ -23,6 +67,11 @@ class CommandHandler:
     configuration changes, etc.
     """
     
+    # Section banners, formatted once
+    _HELP_HEADER = f"\n{Fore.CYAN}Available Commands:{Style.RESET_ALL}\n{'='*60}"
+    _STATS_HEADER = f"\n{Fore.CYAN}Session Statistics:{Style.RESET_ALL}\n{'='*60}"
+    _SCHEMA_HEADER = f"\n{Fore.CYAN}Database Schema:{Style.RESET_ALL}\n{'='*60}"
+    
     def __init__(self, interface):
         """
         Initialize the command handler.
@@ -168,15 +217,31 @@ class CommandHandler:
             }
         }
         
-        # Build alias mapping
+        # Build alias mapping and the flat name/alias -> handler table used
+        # for dispatch in one pass (every entry declares its aliases)
         self.aliases = {}
+        self._dispatch: Dict[str, Callable[[str], None]] = {}
         for cmd, info in self.commands.items():
-            for alias in info.get('aliases', []):
+            func = info['func']
+            self._dispatch[cmd] = func
+            for alias in info['aliases']:
                 self.aliases[alias] = cmd
+                self._dispatch[alias] = func
         
         # Store last result for export
         self.last_result = None
         
+        # Row counts shown by `tables`, reused until the database changes
+        self._table_counts = []
+        self._tables_version = None
+        
+        # (validation, optimization) results by database version and query
+        # text for `analyze`
+        self._analysis_cache: Dict[tuple, tuple] = {}
+        
+        # The command set is fixed, so the full help listing is built once
+        self._help_text = self._build_help_text()
+        
         logger.info("CommandHandler initialized with %d commands", len(self.commands))
     
     def is_command(self, input_text: str) -> bool:
@@ -192,8 +257,9 @@ class CommandHandler:
         if not input_text:
             return False
         
-        first_word = input_text.split()[0].lower()
-        return first_word in self.commands or first_word in self.aliases
+        # Only the first word matters; don't tokenize a long pasted query
+        parts = input_text.split(None, 1)
+        return bool(parts) and parts[0].lower() in self._dispatch
     
     def execute_command(self, input_text: str) -> bool:
         """
@@ -209,14 +275,11 @@ class CommandHandler:
         command = parts[0].lower()
         args = parts[1] if len(parts) > 1 else ""
         
-        # Resolve alias
-        if command in self.aliases:
-            command = self.aliases[command]
-        
-        # Execute command
-        if command in self.commands:
+        # Execute command (aliases resolve to the same handler)
+        func = self._dispatch.get(command)
+        if func:
             try:
-                self.commands[command]['func'](args)
+                func(args)
                 return True
             except Exception as e:
                 self.interface._print_error(f"Command failed: {e}")
@@ -225,6 +288,33 @@ class CommandHandler:
         
         return False
     
+    def _build_help_text(self) -> str:
+        """
+        Render the full command listing shown by `help`.
+        
+        Returns:
+            Help text grouped by category, followed by usage tips
+        """
+        lines = [self._HELP_HEADER]
+        
+        # Group commands by category
+        for category, cmds in _HELP_CATEGORIES:
+            lines.append(f"\n{Fore.YELLOW}{category}:{Style.RESET_ALL}")
+            for cmd in cmds:
+                if cmd in self.commands:
+                    info = self.commands[cmd]
+                    aliases = f" ({', '.join(info['aliases'])})" if info['aliases'] else ""
+                    lines.append(f"  {cmd:15} - {info['description']}{aliases}")
+        
+        lines += [
+            f"\n{Fore.GREEN}Tips:{Style.RESET_ALL}",
+            "  • Type 'help <command>' for detailed help",
+            "  • Use Tab for auto-completion",
+            "  • Use ↑/↓ arrows for command history",
+            "  • Natural language queries don't need commands"
+        ]
+        return "\n".join(lines)
+    
     # Command implementations
     
     def cmd_help(self, args: str):
@@ -237,41 +327,19 @@ class CommandHandler:
             
             if cmd in self.commands:
                 info = self.commands[cmd]
-                print(f"\n{Fore.CYAN}Command: {cmd}{Style.RESET_ALL}")
-                print(f"  Description: {info['description']}")
-                print(f"  Usage: {info['usage']}")
+                lines = [
+                    f"\n{Fore.CYAN}Command: {cmd}{Style.RESET_ALL}",
+                    f"  Description: {info['description']}",
+                    f"  Usage: {info['usage']}"
+                ]
                 if info['aliases']:
-                    print(f"  Aliases: {', '.join(info['aliases'])}")
+                    lines.append(f"  Aliases: {', '.join(info['aliases'])}")
+                print("\n".join(lines))
             else:
                 self.interface._print_error(f"Unknown command: {cmd}")
         else:
             # Show all commands
-            print(f"\n{Fore.CYAN}Available Commands:{Style.RESET_ALL}")
-            print("="*60)
-            
-            # Group commands by category
-            categories = {
-                'Basic': ['help', 'exit', 'clear', 'history'],
-                'Database': ['schema', 'tables', 'analyze'],
-                'Results': ['export', 'cache', 'compare'],
-                'Settings': ['config', 'verbose', 'colors', 'model'],
-                'Advanced': ['optimize', 'validate', 'debug', 'benchmark'],
-                'Other': ['stats', 'reset', 'examples', 'test']
-            }
-            
-            for category, cmds in categories.items():
-                print(f"\n{Fore.YELLOW}{category}:{Style.RESET_ALL}")
-                for cmd in cmds:
-                    if cmd in self.commands:
-                        info = self.commands[cmd]
-                        aliases = f" ({', '.join(info['aliases'])})" if info['aliases'] else ""
-                        print(f"  {cmd:15} - {info['description']}{aliases}")
-            
-            print(f"\n{Fore.GREEN}Tips:{Style.RESET_ALL}")
-            print("  • Type 'help <command>' for detailed help")
-            print("  • Use Tab for auto-completion")
-            print("  • Use ↑/↓ arrows for command history")
-            print("  • Natural language queries don't need commands")
+            print(self._help_text)
     
     def cmd_exit(self, args: str):
         """Exit the application."""
@@ -285,51 +353,64 @@ class CommandHandler:
     
     def cmd_history(self, args: str):
         """Show command history."""
-        n = 20  # Default number of items
+        n = 20  # Default number of items; 0 lists the whole history
         if args:
             try:
                 n = int(args)
+                if n < 0:
+                    raise ValueError(n)
             except ValueError:
                 self.interface._print_error("Invalid number")
                 return
         
-        print(f"\n{Fore.CYAN}Command History (last {n}):{Style.RESET_ALL}")
-        print("="*60)
+        if n == 0:
+            n = len(self.interface.history)
+        
+        lines = [f"\n{Fore.CYAN}Command History (last {n}):{Style.RESET_ALL}", "="*60]
+        
+        # History is a deque, which can't be sliced; skip to the last n entries
+        history = islice(self.interface.history, max(0, len(self.interface.history) - n), None)
         
-        history = self.interface.history[-n:] if len(self.interface.history) > n else self.interface.history
+        # Entries are (time.time(), input) pairs, stamped by InteractiveAgent
+        # when the input was entered
+        for i, (entered_at, cmd) in enumerate(history, 1):
+            timestamp = time.strftime("%H:%M:%S", time.localtime(entered_at))
+            lines.append(f"  {i:3}. [{timestamp}] {cmd}")
         
-        for i, cmd in enumerate(history, 1):
-            timestamp = datetime.now().strftime("%H:%M:%S")  # Simplified
-            print(f"  {i:3}. [{timestamp}] {cmd}")
+        print("\n".join(lines))
     
     def cmd_stats(self, args: str):
         """Show session statistics."""
-        print(f"\n{Fore.CYAN}Session Statistics:{Style.RESET_ALL}")
-        print("="*60)
-        
         # Session info
         duration = datetime.now() - self.interface.session_start
-        print(f"\n{Fore.YELLOW}Session:{Style.RESET_ALL}")
-        print(f"  • Start Time: {self.interface.session_start.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  • Duration: {duration}")
-        print(f"  • Queries Processed: {self.interface.query_count}")
-        print(f"  • Errors: {self.interface.error_count}")
+        lines = [
+            self._STATS_HEADER,
+            f"\n{Fore.YELLOW}Session:{Style.RESET_ALL}",
+            f"  • Start Time: {self.interface.session_start.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"  • Duration: {duration}",
+            f"  • Queries Processed: {self.interface.query_count}",
+            f"  • Errors: {self.interface.error_count}"
+        ]
         
         # Agent statistics
         if self.interface.agent:
             stats = self.interface.agent.get_enhanced_statistics()
             
-            print(f"\n{Fore.YELLOW}Cache Performance:{Style.RESET_ALL}")
-            print(f"  • Cache Size: {stats.get('cache_size', 0)}")
-            print(f"  • Total Queries: {stats.get('total_queries', 0)}")
-            
-            print(f"\n{Fore.YELLOW}Optimization:{Style.RESET_ALL}")
-            print(f"  • Queries Optimized: {stats.get('queries_optimized', 0)}")
-            print(f"  • Avg Improvement: {stats.get('average_optimization_improvement', 0):.1f}%")
-            
-            print(f"\n{Fore.YELLOW}Validation:{Style.RESET_ALL}")
-            print(f"  • Queries Validated: {stats.get('queries_validated', 0)}")
-            print(f"  • Validation Failures: {stats.get('validation_failures', 0)}")
+            lines += [
+                f"\n{Fore.YELLOW}Cache Performance:{Style.RESET_ALL}",
+                f"  • Cache Size: {stats.get('cache_size', 0)}",
+                f"  • Total Queries: {stats.get('total_queries', 0)}",
+                
+                f"\n{Fore.YELLOW}Optimization:{Style.RESET_ALL}",
+                f"  • Queries Optimized: {stats.get('queries_optimized', 0)}",
+                f"  • Avg Improvement: {stats.get('average_optimization_improvement', 0):.1f}%",
+                
+                f"\n{Fore.YELLOW}Validation:{Style.RESET_ALL}",
+                f"  • Queries Validated: {stats.get('queries_validated', 0)}",
+                f"  • Validation Failures: {stats.get('validation_failures', 0)}"
+            ]
+        
+        print("\n".join(lines))
     
     def cmd_schema(self, args: str):
         """Show database schema."""
@@ -343,9 +424,7 @@ class CommandHandler:
             self._show_table_schema(table_name)
         else:
             # Show all tables
-            print(f"\n{Fore.CYAN}Database Schema:{Style.RESET_ALL}")
-            print("="*60)
-            print(self.interface.agent.schema)
+            print(f"{self._SCHEMA_HEADER}\n{self.interface.agent.schema}")
     
     def cmd_tables(self, args: str):
         """List all tables."""
@@ -355,22 +434,43 @@ class CommandHandler:
         
         try:
             cursor = self.interface.agent.conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = cursor.fetchall()
+            version = self._db_version()
             
-            print(f"\n{Fore.CYAN}Database Tables:{Style.RESET_ALL}")
-            print("="*60)
+            if version != self._tables_version:
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+                tables = cursor.fetchall()
+                
+                self._table_counts = []
+                for i, (table,) in enumerate(tables, 1):
+                    if not table.startswith('sqlite_'):
+                        # Get row count
+                        quoted = table.replace('"', '""')
+                        cursor.execute(f'SELECT COUNT(*) FROM "{quoted}"')
+                        self._table_counts.append((i, table, cursor.fetchone()[0]))
+                self._tables_version = version
+            
+            lines = [f"\n{Fore.CYAN}Database Tables:{Style.RESET_ALL}", "="*60]
+            lines += [f"  {i:2}. {table:30} ({count:,} rows)" for i, table, count in self._table_counts]
+            print("\n".join(lines))
             
-            for i, (table,) in enumerate(tables, 1):
-                if not table.startswith('sqlite_'):
-                    # Get row count
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
-                    print(f"  {i:2}. {table:30} ({count:,} rows)")
-                    
         except Exception as e:
             self.interface._print_error(f"Failed to list tables: {e}")
     
+    def _db_version(self) -> tuple:
+        """
+        Identify the current state of the agent's database.
+        
+        Returns:
+            A tuple that changes whenever the data or schema changes
+        """
+        conn = self.interface.agent.conn
+        
+        # data_version and schema_version move when other connections
+        # write; total_changes covers writes made through this one
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        return (conn, data_version, schema_version, conn.total_changes)
+    
     def cmd_export(self, args: str):
         """Export last results."""
         if not self.last_result:
@@ -406,12 +506,13 @@ class CommandHandler:
         
         if not parts:
             # Show all config
-            print(f"\n{Fore.CYAN}Configuration:{Style.RESET_ALL}")
-            print("="*60)
-            
-            for key, value in self.interface.config.items():
-                if key != 'api_key':  # Don't show API key
-                    print(f"  {key:20} = {value}")
+            lines = [f"\n{Fore.CYAN}Configuration:{Style.RESET_ALL}", "="*60]
+            lines += [
+                f"  {key:20} = {value}"
+                for key, value in self.interface.config.items()
+                if key != 'api_key'  # Don't show API key
+            ]
+            print("\n".join(lines))
         elif len(parts) == 1:
             # Show specific config
             key = parts[0]
@@ -424,9 +525,10 @@ class CommandHandler:
             key, value = parts[0], parts[1]
             
             # Convert value to appropriate type
-            if value.lower() in ['true', 'false']:
-                value = value.lower() == 'true'
-            elif value.isdigit():
+            flag = _BOOL_VALUES.get(value.lower())
+            if flag is not None:
+                value = flag
+            elif value.isdigit() or (value[:1] == '-' and value[1:].isdigit()):
                 value = int(value)
             
             self.interface.config[key] = value
@@ -450,6 +552,7 @@ class CommandHandler:
             if self.interface.agent:
                 self.interface.agent.reset_statistics()
                 self.interface.agent.clear_cache()
+            self._analysis_cache.clear()
             
             self.interface.query_count = 0
             self.interface.error_count = 0
@@ -459,43 +562,19 @@ class CommandHandler:
     
     def cmd_examples(self, args: str):
         """Show example queries."""
-        categories = {
-            'basic': [
-                "Show all products",
-                "List customers from New York",
-                "Find orders from last week"
-            ],
-            'aggregation': [
-                "What is the total revenue?",
-                "How many orders per month?",
-                "Average order value by customer type"
-            ],
-            'analysis': [
-                "Top 10 best-selling products",
-                "Customers who spent more than $1000",
-                "Products with low stock"
-            ],
-            'complex': [
-                "Which products are frequently bought together?",
-                "Customer lifetime value analysis",
-                "Revenue trend over time"
-            ]
-        }
-        
-        if args and args in categories:
+        if args and args in _EXAMPLES:
             # Show specific category
-            print(f"\n{Fore.CYAN}{args.title()} Examples:{Style.RESET_ALL}")
-            for example in categories[args]:
-                print(f"  • {example}")
+            lines = [f"\n{Fore.CYAN}{args.title()} Examples:{Style.RESET_ALL}"]
+            lines += [f"  • {example}" for example in _EXAMPLES[args]]
         else:
             # Show all categories
-            print(f"\n{Fore.CYAN}Example Queries:{Style.RESET_ALL}")
-            print("="*60)
+            lines = [f"\n{Fore.CYAN}Example Queries:{Style.RESET_ALL}", "="*60]
             
-            for category, examples in categories.items():
-                print(f"\n{Fore.YELLOW}{category.title()}:{Style.RESET_ALL}")
-                for example in examples:
-                    print(f"  • {example}")
+            for category, examples in _EXAMPLES.items():
+                lines.append(f"\n{Fore.YELLOW}{category.title()}:{Style.RESET_ALL}")
+                lines += [f"  • {example}" for example in examples]
+        
+        print("\n".join(lines))
     
     def cmd_optimize(self, args: str):
         """Toggle query optimization."""
@@ -526,17 +605,17 @@ class CommandHandler:
             self.interface._print_success("Cache cleared")
         elif args == 'stats':
             stats = self.interface.agent.get_statistics()
-            print(f"\n{Fore.CYAN}Cache Statistics:{Style.RESET_ALL}")
-            print(f"  • Cache Size: {stats.get('cache_size', 0)}")
-            print(f"  • Hit Rate: {stats.get('cache_hit_rate', 0):.1f}%")
+            print("\n".join([
+                f"\n{Fore.CYAN}Cache Statistics:{Style.RESET_ALL}",
+                f"  • Cache Size: {stats.get('cache_size', 0)}",
+                f"  • Hit Rate: {stats.get('cache_hit_rate', 0):.1f}%"
+            ]))
         else:
             self.interface._print_info("Usage: cache [clear|stats]")
     
     def cmd_model(self, args: str):
         """Switch OpenAI model."""
-        valid_models = ['gpt-4', 'gpt-3.5-turbo', 'gpt-4-turbo']
-        
-        if args in valid_models:
+        if args in _VALID_MODELS:
             if self.interface.agent:
                 self.interface.agent.model = args
                 self.interface._print_success(f"Switched to model: {args}")
@@ -544,7 +623,7 @@ class CommandHandler:
                 self.interface.config['model'] = args
                 self.interface._print_success(f"Model will be set to {args} on next init")
         else:
-            self.interface._print_error(f"Invalid model. Choose from: {', '.join(valid_models)}")
+            self.interface._print_error(f"Invalid model. Choose from: {', '.join(sorted(_VALID_MODELS))}")
     
     def cmd_debug(self, args: str):
         """Toggle debug mode."""
@@ -564,19 +643,20 @@ class CommandHandler:
             "Customers with no orders"
         ]
         
-        print(f"\n{Fore.CYAN}Running Test Suite:{Style.RESET_ALL}")
-        print("="*60)
+        print(f"\n{Fore.CYAN}Running Test Suite:{Style.RESET_ALL}\n" + "="*60)
         
+        # Each test's lines are written together once it has run
         for i, query in enumerate(test_queries, 1):
-            print(f"\nTest {i}: {query}")
+            lines = [f"\nTest {i}: {query}"]
             try:
                 result = self.interface.agent.process_question(query)
                 if result['success']:
-                    print(f"  {Fore.GREEN}✓ Passed{Style.RESET_ALL} ({result['row_count']} rows)")
+                    lines.append(f"  {Fore.GREEN}✓ Passed{Style.RESET_ALL} ({result['row_count']} rows)")
                 else:
-                    print(f"  {Fore.RED}✗ Failed{Style.RESET_ALL}: {result.get('error')}")
+                    lines.append(f"  {Fore.RED}✗ Failed{Style.RESET_ALL}: {result.get('error')}")
             except Exception as e:
-                print(f"  {Fore.RED}✗ Error{Style.RESET_ALL}: {e}")
+                lines.append(f"  {Fore.RED}✗ Error{Style.RESET_ALL}: {e}")
+            print("\n".join(lines))
     
     def cmd_analyze(self, args: str):
         """Analyze a SQL query."""
@@ -588,32 +668,61 @@ class CommandHandler:
             self.interface._print_error("Agent not initialized")
             return
         
-        print(f"\n{Fore.CYAN}Query Analysis:{Style.RESET_ALL}")
-        print("="*60)
+        validation, optimization = self._analyze_query(args.strip())
+        
+        lines = [f"\n{Fore.CYAN}Query Analysis:{Style.RESET_ALL}", "="*60]
         
         # Validate query
-        if hasattr(self.interface.agent, 'validator'):
-            validation = self.interface.agent.validator.validate(args)
+        if validation is not None:
             
-            print(f"\n{Fore.YELLOW}Validation:{Style.RESET_ALL}")
-            print(f"  • Valid: {'✓' if validation['is_valid'] else '✗'}")
-            print(f"  • Risk Level: {validation.get('risk_level', 'unknown')}")
+            lines += [
+                f"\n{Fore.YELLOW}Validation:{Style.RESET_ALL}",
+                f"  • Valid: {'✓' if validation['is_valid'] else '✗'}",
+                f"  • Risk Level: {validation.get('risk_level', 'unknown')}"
+            ]
             
             if validation.get('warnings'):
-                print(f"\n{Fore.YELLOW}Warnings:{Style.RESET_ALL}")
-                for warning in validation['warnings']:
-                    print(f"  • {warning}")
+                lines.append(f"\n{Fore.YELLOW}Warnings:{Style.RESET_ALL}")
+                lines += [f"  • {warning}" for warning in validation['warnings']]
         
         # Optimize query
-        if hasattr(self.interface.agent, 'optimizer'):
-            optimization = self.interface.agent.optimizer.optimize(args)
-            
+        if optimization is not None:
             if optimization['is_optimized']:
-                print(f"\n{Fore.YELLOW}Optimizations:{Style.RESET_ALL}")
-                for opt in optimization['optimizations_applied']:
-                    print(f"  • {opt}")
-                print(f"\n{Fore.GREEN}Optimized Query:{Style.RESET_ALL}")
-                print(optimization['optimized_query'])
+                lines.append(f"\n{Fore.YELLOW}Optimizations:{Style.RESET_ALL}")
+                lines += [f"  • {opt}" for opt in optimization['optimizations_applied']]
+                lines.append(f"\n{Fore.GREEN}Optimized Query:{Style.RESET_ALL}")
+                lines.append(optimization['optimized_query'])
+        
+        print("\n".join(lines))
+    
+    def _analyze_query(self, query: str) -> tuple:
+        """
+        Validate and optimize a query, reusing earlier results for the same text.
+        
+        Results are only reused while the database is unchanged, since the
+        schema and EXPLAIN checks depend on it.
+        
+        Args:
+            query: SQL query to analyze
+            
+        Returns:
+            (validation, optimization) results; either is None when the agent
+            has no validator or optimizer
+        """
+        key = (self._db_version(), query)
+        if key in self._analysis_cache:
+            return self._analysis_cache[key]
+        
+        agent = self.interface.agent
+        validation = agent.validator.validate(query) if hasattr(agent, 'validator') else None
+        optimization = agent.optimizer.optimize(query) if hasattr(agent, 'optimizer') else None
+        
+        # Evict the oldest entry once full (dicts keep insertion order)
+        if len(self._analysis_cache) >= _ANALYSIS_CACHE_SIZE:
+            del self._analysis_cache[next(iter(self._analysis_cache))]
+        self._analysis_cache[key] = (validation, optimization)
+        
+        return validation, optimization
     
     def cmd_compare(self, args: str):
         """Compare two queries."""
@@ -660,8 +769,7 @@ class CommandHandler:
     
     def cmd_benchmark(self, args: str):
         """Run performance benchmark."""
-        print(f"\n{Fore.CYAN}Running Performance Benchmark:{Style.RESET_ALL}")
-        print("="*60)
+        print(f"\n{Fore.CYAN}Running Performance Benchmark:{Style.RESET_ALL}\n" + "="*60)
         
         benchmark_queries = [
             "SELECT COUNT(*) FROM orders",
@@ -671,25 +779,38 @@ class CommandHandler:
         
         total_time = 0
         
-        for i, query in enumerate(benchmark_queries, 1):
-            print(f"\nBenchmark {i}: {query[:50]}...")
-            
-            try:
-                import time
-                start = time.time()
-                
-                cursor = self.interface.agent.conn.cursor()
-                cursor.execute(query)
-                results = cursor.fetchall()
-                
-                elapsed = time.time() - start
-                total_time += elapsed
+        # One cursor and one read transaction for the whole run, so every
+        # query sees the same snapshot and none pays for its own
+        conn = self.interface.agent.conn
+        cursor = conn.cursor()
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            cursor.execute("BEGIN")
+        
+        try:
+            # Each benchmark's lines are written together once it has run
+            for i, query in enumerate(benchmark_queries, 1):
+                lines = [f"\nBenchmark {i}: {query[:50]}..."]
                 
-                print(f"  • Time: {elapsed:.3f}s")
-                print(f"  • Rows: {len(results)}")
+                try:
+                    start = time.perf_counter()
+                    
+                    cursor.execute(query)
+                    results = cursor.fetchall()
+                    
+                    elapsed = time.perf_counter() - start
+                    total_time += elapsed
+                    
+                    lines.append(f"  • Time: {elapsed:.3f}s")
+                    lines.append(f"  • Rows: {len(results)}")
+                    
+                except Exception as e:
+                    lines.append(f"  • {Fore.RED}Failed{Style.RESET_ALL}: {e}")
                 
-            except Exception as e:
-                print(f"  • {Fore.RED}Failed{Style.RESET_ALL}: {e}")
+                print("\n".join(lines))
+        finally:
+            if own_transaction:
+                conn.commit()
         
         print(f"\n{Fore.GREEN}Total Time: {total_time:.3f}s{Style.RESET_ALL}")
     
@@ -698,42 +819,46 @@ class CommandHandler:
         try:
             cursor = self.interface.agent.conn.cursor()
             
+            # The pragma table-valued functions take the table name as a bound
+            # parameter, so these statements are constant and never splice input
+            
             # Get table info
-            cursor.execute(f"PRAGMA table_info({table_name})")
+            cursor.execute("SELECT * FROM pragma_table_info(?)", (table_name,))
             columns = cursor.fetchall()
             
             if not columns:
                 self.interface._print_error(f"Table '{table_name}' not found")
                 return
             
-            print(f"\n{Fore.CYAN}Table: {table_name}{Style.RESET_ALL}")
-            print("="*60)
-            
-            print(f"\n{Fore.YELLOW}Columns:{Style.RESET_ALL}")
+            lines = [
+                f"\n{Fore.CYAN}Table: {table_name}{Style.RESET_ALL}",
+                "="*60,
+                f"\n{Fore.YELLOW}Columns:{Style.RESET_ALL}"
+            ]
             for col in columns:
                 cid, name, dtype, notnull, default, pk = col
                 nullable = "NOT NULL" if notnull else "NULL"
                 primary = " [PRIMARY KEY]" if pk else ""
                 default_val = f" DEFAULT {default}" if default else ""
-                print(f"  • {name}: {dtype} {nullable}{primary}{default_val}")
+                lines.append(f"  • {name}: {dtype} {nullable}{primary}{default_val}")
             
             # Get foreign keys
-            cursor.execute(f"PRAGMA foreign_key_list({table_name})")
+            cursor.execute("SELECT * FROM pragma_foreign_key_list(?)", (table_name,))
             foreign_keys = cursor.fetchall()
             
             if foreign_keys:
-                print(f"\n{Fore.YELLOW}Foreign Keys:{Style.RESET_ALL}")
-                for fk in foreign_keys:
-                    print(f"  • {fk[3]} → {fk[2]}.{fk[4]}")
+                lines.append(f"\n{Fore.YELLOW}Foreign Keys:{Style.RESET_ALL}")
+                lines += [f"  • {fk[3]} → {fk[2]}.{fk[4]}" for fk in foreign_keys]
             
             # Get indexes
-            cursor.execute(f"PRAGMA index_list({table_name})")
+            cursor.execute("SELECT * FROM pragma_index_list(?)", (table_name,))
             indexes = cursor.fetchall()
             
             if indexes:
-                print(f"\n{Fore.YELLOW}Indexes:{Style.RESET_ALL}")
-                for idx in indexes:
-                    print(f"  • {idx[1]}")
+                lines.append(f"\n{Fore.YELLOW}Indexes:{Style.RESET_ALL}")
+                lines += [f"  • {idx[1]}" for idx in indexes]
+            
+            print("\n".join(lines))
                     
         except Exception as e:
             self.interface._print_error(f"Failed to get schema: {e}")
@@ -7,6 +7,7 @@ import os
 import sys
 import time
 import readline  # For command history
+from collections import deque
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from colorama import init, Fore, Back, Style
@@ -59,8 +60,9 @@ class InteractiveAgent:
         self.verbose_mode = self.config.get('verbose_mode', False)
         self.auto_export = self.config.get('auto_export', False)
         
-        # Command history
-        self.history = []
+        # Command history as (timestamp, input) pairs; the oldest entries
+        # drop off once max_history is reached
+        self.history = deque(maxlen=max(1, self.config.get('max_history', 100)))
         self.history_file = self.config.get('history_file', '.agent_history')
         self._load_history()
         
@@ -210,8 +212,8 @@ class InteractiveAgent:
                 if not user_input:
                     continue
                 
-                # Add to history
-                self.history.append(user_input)
+                # Add to history, stamped for the history command
+                self.history.append((time.time(), user_input))
                 self._save_history()
                 
                 # Process input
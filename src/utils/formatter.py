@@ -141,14 +141,34 @@ class ResultFormatter:
         Returns:
             JSON string
         """
-        result = []
+        output = io.StringIO()
+        self._write_json(output, columns, data)
+        return output.getvalue()
+    
+    def _write_json(self, stream, columns: List[str], data: List[Tuple]):
+        """
+        Write data as an indented JSON array, one row object at a time.
+        
+        Produces the same text as json.dumps(rows, indent=2) without holding
+        every row dict in memory at once.
+        
+        Args:
+            stream: Text stream to write to
+            columns: Column names
+            data: Data rows
+        """
+        separator = '[\n  '
         for row in data:
             row_dict = {}
             for col, val in zip(columns, row):
                 row_dict[col] = self._serialize_value(val)
-            result.append(row_dict)
+            # Newlines inside values are escaped, so every real newline is
+            # structural and just needs the array's extra indent level
+            stream.write(separator)
+            stream.write(json.dumps(row_dict, indent=2, default=str).replace('\n', '\n  '))
+            separator = ',\n  '
         
-        return json.dumps(result, indent=2, default=str)
+        stream.write('[]' if separator == '[\n  ' else '\n]')
     
     def _format_as_csv(self, columns: List[str], data: List[Tuple]) -> str:
         """
@@ -162,16 +182,26 @@ class ResultFormatter:
             CSV string
         """
         output = io.StringIO()
-        writer = csv.writer(output)
+        self._write_csv(output, columns, data)
+        return output.getvalue()
+    
+    def _write_csv(self, stream, columns: List[str], data: List[Tuple]):
+        """
+        Write data as CSV.
+        
+        Args:
+            stream: Text stream to write to (files opened with newline='')
+            columns: Column names
+            data: Data rows
+        """
+        writer = csv.writer(stream)
         
         # Write header
         writer.writerow(columns)
         
         # Write data
-        for row in data:
-            writer.writerow([self._format_value(val) for val in row])
-        
-        return output.getvalue()
+        format_value = self._format_value
+        writer.writerows([format_value(val) for val in row] for row in data)
     
     def _format_as_html(self, columns: List[str], data: List[Tuple]) -> str:
         """
@@ -367,17 +397,22 @@ class ResultFormatter:
             True if successful, False otherwise
         """
         try:
+            # CSV and JSON stream rows straight to the file instead of
+            # building the whole export as one string first
             if format_type == 'json':
-                content = self._format_as_json(columns, data)
+                with open(filename, 'w', encoding='utf-8') as f:
+                    self._write_json(f, columns, data)
             elif format_type == 'csv':
-                content = self._format_as_csv(columns, data)
-            elif format_type == 'html':
-                content = self._format_as_html(columns, data)
+                with open(filename, 'w', encoding='utf-8', newline='') as f:
+                    self._write_csv(f, columns, data)
             else:
-                content = self._format_as_table(columns, data)
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+                if format_type == 'html':
+                    content = self._format_as_html(columns, data)
+                else:
+                    content = self._format_as_table(columns, data)
+                
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(content)
             
             logger.info(f"Exported results to {filename}")
             return True